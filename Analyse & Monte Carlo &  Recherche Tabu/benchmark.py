@@ -0,0 +1,263 @@
+import argparse
+import atexit
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import runpy
+import shutil
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from pfe import datastore
+
+# Benchmarks of the simulation, scheduling and analysis hot paths on synthetic inputs of several sizes.
+# Results are written as JSON, tagged with the current commit, so runs can be compared across commits:
+#     python benchmark.py --output bench.json
+# The analysis scripts (pfe.dataperseg, pfe.nbtrucksinbase, pfe.ParametersDistrib) are timed end to end,
+# run in a scratch directory holding synthetic versions of their input CSVs.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SEGMENTS = ["DNM", "TST", "WL"]
+
+
+def synthetic_trucks(n_trucks):
+    return [{"truck_id": f"{i:05d}", "BL": random.choice(SEGMENTS)} for i in range(n_trucks)]
+
+
+# n_days of gate events, trucks_per_day visits per day between 07:00 and 18:00.
+# Starts on a non-leap year: PerSegPerTime.csv dates carry no year and are parsed as 1900.
+def synthetic_visits(n_days, trucks_per_day=10):
+    first_day = datetime.date(2023, 1, 1)
+    days = np.repeat(np.arange(n_days), trucks_per_day)
+    entry = np.random.randint(7 * 60, 16 * 60, len(days))
+    exit = np.minimum(entry + np.random.randint(20, 150, len(days)), 18 * 60 + 59)
+    dates = [first_day + datetime.timedelta(days=int(day)) for day in days]
+    return dates, entry, exit
+
+
+def hhmm(minutes):
+    return [f"{m // 60:02d}:{m % 60:02d}" for m in minutes]
+
+
+def write_per_seg_per_time(directory, n_days):
+    dates, entry, exit = synthetic_visits(n_days)
+    pd.DataFrame({
+        "Date": [f"{date.day}-{date.strftime('%b')}" for date in dates],
+        "Mat": [f"{i:05d}-000" for i in range(len(dates))],
+        "Seg": np.random.choice(SEGMENTS, len(dates)),
+        "Entry": hhmm(entry),
+        "Exit": hhmm(exit),
+    }).to_csv(os.path.join(directory, "PerSegPerTime.csv"), index=False)
+
+
+def write_entry_exit(directory, n_days):
+    dates, entry, exit = synthetic_visits(n_days)
+    pd.DataFrame({
+        "Jour": [date.strftime("%d-%b") for date in dates],
+        "Matricule ": [f"{i:05d}-000" for i in range(len(dates))],
+        "Seg": np.random.choice(SEGMENTS, len(dates)),
+        "Type": "",
+        "Entrée": "",
+        "Date": [date.strftime("%d/%m/%Y") for date in dates],
+        "EntryTime": [f"{m // 60}:{m % 60:02d}" for m in entry],
+        "ExitTime": [f"{m // 60}:{m % 60:02d}" for m in exit],
+        "Durée dans la base": "",
+    }).to_csv(os.path.join(directory, "EnteryExit.csv"), index=False)
+
+
+def write_time_loss_data(directory, n_rows):
+    columns = pd.read_csv(os.path.join(HERE, "time_loss_data.csv"), nrows=0).columns
+    data = {}
+    for column in columns:
+        minutes = np.random.lognormal(np.log(20), 0.8, n_rows).astype(int) + 1
+        values = np.array([f"{m // 60:02d}:{m % 60:02d}:00" for m in minutes], dtype=object)
+        values[np.random.rand(n_rows) < 0.5] = None
+        data[column] = values
+    pd.DataFrame(data).to_csv(os.path.join(directory, "time_loss_data.csv"), index=False)
+
+
+# Run an analysis script (a module of the pfe package) as __main__ from directory, without its
+# output or plot windows
+def run_script(directory, script):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            runpy.run_module(f"pfe.{script}", run_name="__main__")
+    finally:
+        plt.close("all")
+        os.chdir(cwd)
+
+
+# Each benchmark takes its scale and returns the function to time; the setup is not timed
+def bench_montecarlo_sim(n_simulations):
+    from pfe import level2Montefuction
+
+    def run():
+        default = level2Montefuction.n_simulations
+        level2Montefuction.n_simulations = n_simulations
+        try:
+            level2Montefuction.MontecarloSim(datetime.datetime(1900, 1, 1, 9, 0), 3, "DNM")
+        finally:
+            level2Montefuction.n_simulations = default
+    return run
+
+
+def bench_objective_function(n_trucks):
+    from pfe import level2ExecutionCode
+
+    schedule = level2ExecutionCode.solution_zero(synthetic_trucks(n_trucks))
+
+    def run():
+        level2ExecutionCode.simulation_cache.clear()
+        level2ExecutionCode.objective_function(schedule)
+    return run
+
+
+# One iteration of the search from a random schedule, 16 moves scored like level2ExecutionCode.main,
+# on a cold cache; the schedule and its objective are built beforehand
+def bench_tabu_iteration(n_trucks):
+    from pfe import level2ExecutionCode
+    from pfe.tabumemory import TabuMemory
+
+    schedule = level2ExecutionCode.solution_zero(synthetic_trucks(n_trucks))
+    objective = level2ExecutionCode.IncrementalObjective(schedule)
+    best_time, _ = objective.value()
+
+    def run():
+        level2ExecutionCode.simulation_cache.clear()
+        level2ExecutionCode.tabu_iteration(schedule, objective, TabuMemory(50), 0, best_time, neighborhood_size=16)
+    return run
+
+
+# n_routes origin/destination distances of 1 to 800 km, 1000 simulations each
+def bench_travel_routes(n_routes):
+    from pfe import montecarloLVL1
+
+    distances = np.random.uniform(1, 800, n_routes)
+    return lambda: montecarloLVL1.route_statistics(distances, n_simulations=1000)
+
+
+def bench_simulate_day(n_trucks):
+    from pfe import basedes
+    from pfe import level2ExecutionCode
+
+    schedule = level2ExecutionCode.solution_zero(synthetic_trucks(n_trucks))
+    return lambda: basedes.simulate_day(schedule, replications=100)
+
+
+# state: files the script keeps between runs, removed before each run so every run starts cold
+def bench_script(script, write_input, state=()):
+    def bench(scale):
+        directory = tempfile.mkdtemp(prefix="bench_")
+        atexit.register(shutil.rmtree, directory, True)
+        write_input(directory, scale)
+
+        def run():
+            for name in state:
+                path = os.path.join(directory, name)
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                elif os.path.exists(path):
+                    os.remove(path)
+            run_script(directory, script)
+        return run
+    return bench
+
+
+BENCHMARKS = {
+    "montecarlo_sim": (bench_montecarlo_sim, [1000, 10000, 100000]),
+    "objective_function": (bench_objective_function, [10, 100, 1000]),
+    "tabu_iteration": (bench_tabu_iteration, [10, 100, 1000]),
+    "simulate_day": (bench_simulate_day, [10, 100, 1000]),
+    "travel_routes": (bench_travel_routes, [100, 1000, 5000]),
+    "fit_distributions": (
+        bench_script("ParametersDistrib", write_time_loss_data, state=[datastore.CACHE_DIR]), [60, 600, 6000]
+    ),
+    "dataperseg_days": (
+        bench_script("dataperseg", write_per_seg_per_time, state=[datastore.CACHE_DIR]), [1, 30, 365]
+    ),
+    # nbtrucksinbase always plots days 1-18, so it needs at least that many
+    "nbtrucksinbase_days": (
+        bench_script("nbtrucksinbase", write_entry_exit, state=["truck_count_store.pkl"]), [30, 365, 730]
+    ),
+}
+
+
+def time_call(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=HERE, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(names, repeat=3, max_scale=None, seed=0):
+    random.seed(seed)
+    np.random.seed(seed)
+    results = []
+    for name in names:
+        make, scales = BENCHMARKS[name]
+        for scale in scales:
+            if max_scale is not None and scale > max_scale:
+                continue
+            times = time_call(make(scale), repeat)
+            results.append({
+                "name": name,
+                "scale": scale,
+                "repeat": repeat,
+                "min_seconds": min(times),
+                "median_seconds": float(np.median(times)),
+            })
+            print(f"{name:22s} {scale:>8d}  min {min(times):10.4f} s  median {np.median(times):10.4f} s")
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the simulation, scheduling and analysis hot paths")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-scale", type=int, default=None, help="skip scales above this one")
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output)
+
+    # The simulation modules read their CSVs from the working directory
+    os.chdir(HERE)
+    report = run_benchmarks(args.only, args.repeat, args.max_scale)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import argparse
+import datetime
+
+import numpy as np
+
+from pfe.level2Montefuction import distributions, simulate_time_at_base, EPS
+from pfe.paramtables import SEGMENTS, truck_count_params
+from pfe.sampling import as_generator, estimate_with_errors
+
+# Number of simulations and how their uniforms are drawn, one of sampling.SAMPLING_MODES
+n_simulations = 1024
+sampling = "sobol"
+
+# Seed of the random draws, None for different draws on every run
+seed = None
+
+# Trucks do not drive at night: the part of a mission after NIGHT_START (23:00) is driven from
+# NIGHT_END (08:00) the next morning
+NIGHT_START = 23
+NIGHT_END = 8
+NIGHT = (24 - NIGHT_START + NIGHT_END) * np.timedelta64(1, "h")
+
+# Percentiles of the arrival time written for each mission in batch mode
+ETA_PERCENTILES = [5, 50, 95]
+
+ONE_HOUR = np.timedelta64(1, "h")
+
+# Longest leg of a mission (km) accepted as input
+MAX_DISTANCE = 10000
+
+# Calculate travel time (a distance or an array of distances)
+def calculate_travel_time(distance_km, speed_kph=80, pause_interval=2, pause_duration=15):
+    travel_time_hours = distance_km / speed_kph
+    num_pauses = travel_time_hours // pause_interval
+    total_pause_time = num_pauses * (pause_duration / 60)
+    total_travel_time_hours = travel_time_hours + total_pause_time
+    return total_travel_time_hours
+
+# Raise ValueError unless every distance (km) of the named input is a number from 0 to MAX_DISTANCE
+def check_distances(distances, name):
+    distances = np.asarray(distances, dtype=float)
+    invalid = ~((distances >= 0) & (distances <= MAX_DISTANCE))
+    if invalid.any():
+        raise ValueError(f"{name} must be between 0 and {MAX_DISTANCE} km, got {distances[invalid].tolist()}")
+
+# Durations in hours as NumPy timedeltas, to the microsecond like datetime.timedelta
+def hours_to_timedelta(hours):
+    return np.rint(np.asarray(hours) * 3.6e9).astype(np.int64).astype("timedelta64[us]")
+
+# Arrival times (datetime64) of missions that started at start, continued the next day: a mission
+# still under way at NIGHT_START and arriving during the night is moved to NIGHT_END the next
+# morning plus the time it had left after NIGHT_START
+def overnight_rollover(arrival, start):
+    arrival = np.asarray(arrival, dtype="datetime64[us]")
+    start = np.asarray(start, dtype="datetime64[us]")
+    # Last NIGHT_START at or before the arrival
+    night_start = (arrival - NIGHT_START * ONE_HOUR).astype("datetime64[D]") + NIGHT_START * ONE_HOUR
+    after_night_start = arrival - night_start
+    at_night = (after_night_start > np.timedelta64(0, "us")) & (after_night_start < NIGHT) & (night_start > start)
+    return np.where(at_night, arrival + NIGHT, arrival)
+
+# Time at the base (hours) of n_simulations trucks of segment arriving at the base at arrival_hour,
+# with the number of trucks already there drawn from the hourly counts.
+# Returns the simulated times, their estimated statistics and the standard errors of those.
+def simulate_base_time(arrival_hour, segment, rng=None):
+    from scipy.special import ndtri
+
+    average, std_dev = truck_count_params(arrival_hour)
+
+    # The first columns of u drive the events at the base, the last one the number of trucks there
+    def simulate(u):
+        # Generate the number of trucks at the base
+        num_trucks_at_base = average + std_dev * ndtri(np.clip(u[:, -1], EPS, 1 - EPS))
+        num_trucks_at_base = np.maximum(0, num_trucks_at_base.astype(int))  # Ensure non-negative number of trucks
+
+        # Simulate the total time at the base for each event
+        return simulate_time_at_base(arrival_hour, num_trucks_at_base, segment, u[:, :-1]) / 60
+
+    return estimate_with_errors(simulate, sampling, n_simulations, len(distributions) + 1, rng=rng)
+
+# Arrival at the base (datetime64) of missions leaving at start to travel distance_to_md1 km
+def mission_arrivals(start, distance_to_md1):
+    total_travel_time_to_base = calculate_travel_time(np.asarray(distance_to_md1, dtype=float))
+    return np.asarray(start, dtype="datetime64[us]") + hours_to_timedelta(total_travel_time_to_base)
+
+# Arrival times at the second destination of missions leaving at start and reaching the base at
+# arrival_time_at_base, staying there time_at_base hours (one column per percentile) and then
+# travelling distance_to_base km, after the overnight rollover
+def destination_arrivals(start, arrival_time_at_base, time_at_base, distance_to_base):
+    travel_time_to_base = calculate_travel_time(np.asarray(distance_to_base, dtype=float))
+    arrival = (
+        arrival_time_at_base[:, None]
+        + hours_to_timedelta(time_at_base)
+        + hours_to_timedelta(travel_time_to_base)[:, None]
+    )
+    return overnight_rollover(arrival, np.asarray(start, dtype="datetime64[us]")[:, None])
+
+# Read a mission file: one mission per row, with the columns
+#   mission_id        optional, the row number if missing
+#   distance_to_md1   distance from the original location to MD1 (km)
+#   distance_to_base  distance from MD1 to the base (km)
+#   segment           DNM, TST or WL
+#   start             departure, "YYYY-MM-DD HH:MM"
+def read_missions(file_path):
+    import pandas as pd
+
+    missions = pd.read_csv(file_path, dtype={"segment": str})
+    if "mission_id" not in missions:
+        missions.insert(0, "mission_id", np.arange(len(missions)))
+    unknown = ~missions["segment"].isin(SEGMENTS[1:])
+    if unknown.any():
+        raise ValueError(f"{file_path}: unknown segment for mission(s) {list(missions['mission_id'][unknown])}")
+    for column in ["distance_to_md1", "distance_to_base"]:
+        check_distances(missions[column], f"{file_path}: {column}")
+    missions["start"] = pd.to_datetime(missions["start"], format="%Y-%m-%d %H:%M")
+    return missions
+
+# 5th/50th/95th percentile arrival times of every mission (DataFrame of read_missions).
+# The time at the base only depends on the hour the truck gets there and its segment, so each
+# (hour, segment) is simulated once, with the same draws for all missions sharing it, and the
+# arrival times of all missions follow from datetime arithmetic over arrays.
+def mission_etas(missions, rng=None):
+    import pandas as pd
+
+    rng = as_generator(rng)
+    start = missions["start"].to_numpy()
+    arrival_time_at_base = mission_arrivals(start, missions["distance_to_md1"].to_numpy())
+    arrival_hours = (arrival_time_at_base - arrival_time_at_base.astype("datetime64[D]")) // ONE_HOUR
+    segment_codes = np.array([SEGMENTS.index(segment) for segment in missions["segment"]])
+
+    # Percentiles of the time at the base (hours) of each mission, one simulation per group
+    groups, group_index = np.unique(arrival_hours * len(SEGMENTS) + segment_codes, return_inverse=True)
+    group_percentiles = np.empty((len(groups), len(ETA_PERCENTILES)))
+    for g, group in enumerate(groups):
+        arrival_hour, code = divmod(int(group), len(SEGMENTS))
+        time_at_base, _, _ = simulate_base_time(arrival_hour, SEGMENTS[code], rng)
+        group_percentiles[g] = np.percentile(time_at_base, ETA_PERCENTILES)
+
+    # Leave the base and reach the second destination
+    etas = destination_arrivals(
+        start, arrival_time_at_base, group_percentiles[group_index], missions["distance_to_base"].to_numpy()
+    )
+    result = pd.DataFrame({
+        "mission_id": missions["mission_id"].to_numpy(),
+        "arrival_at_base": arrival_time_at_base,
+    })
+    for k, percentile in enumerate(ETA_PERCENTILES):
+        result[f"eta_p{percentile}"] = etas[:, k]
+    return result
+
+def run_batch(missions_path, output_path, rng=None):
+    etas = mission_etas(read_missions(missions_path), rng)
+    etas.to_csv(output_path, index=False, date_format="%Y-%m-%d %H:%M")
+    print(f"Arrival times of {len(etas)} missions written to {output_path}")
+
+def run_interactive(rng=None):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Get user inputs
+    distance_to_md1 = float(input("Enter distance from original location to MD1 (in km): "))
+    distance_to_base = float(input("Enter distance from MD1 to base (in km): "))
+    segment = input("Enter the mission's segment (DNM, TST, WL): ")
+    while segment not in ["DNM", "TST", "WL"]:
+        segment = input("Invalid segment. Enter the mission's segment (DNM, TST, WL): ")
+    start_date_str = input("Enter the start date (YYYY-MM-DD): ")
+    departure_time_str = input("Enter the time of departure (HH:MM): ")
+    start_datetime_str = f"{start_date_str} {departure_time_str}"
+    start_datetime = datetime.datetime.strptime(start_datetime_str, "%Y-%m-%d %H:%M")
+
+    # Calculate travel time to the base
+    travel_time_to_md1 = calculate_travel_time(distance_to_md1)
+    travel_time_to_base = calculate_travel_time(distance_to_base)
+    total_travel_time_to_base = travel_time_to_md1 
+
+    # Calculate arrival time at the base
+    arrival_time_at_base = start_datetime + datetime.timedelta(hours=total_travel_time_to_base)
+    arrival_hour = arrival_time_at_base.hour
+
+    # Simulate the time at the base; the total mission time adds the travel there and the time to
+    # leave the base and reach the second destination
+    time_at_base, estimates, errors = simulate_base_time(arrival_hour, segment, rng)
+    offset = total_travel_time_to_base + travel_time_to_base
+    simulation_results = time_at_base + offset
+    estimates = {name: estimate + offset if name != "std" else estimate for name, estimate in estimates.items()}
+
+    # Calculate the 90% confidence interval for total times
+    lower_bound = np.percentile(simulation_results, 5)
+    upper_bound = np.percentile(simulation_results, 95)
+    average_bound = np.percentile(simulation_results, 50)
+
+    # Convert bounds to datetime, the part of the mission after 23:00 being driven the next morning
+    arrival_time_lower_bound, arrival_time_upper_bound, arrival_time_average = overnight_rollover(
+        np.datetime64(start_datetime) + hours_to_timedelta([lower_bound, upper_bound, average_bound]),
+        np.datetime64(start_datetime),
+    ).tolist()
+    print(f"90% confidence interval for arrival time: {arrival_time_lower_bound} to {arrival_time_upper_bound}")
+    print(f"Average arrival time: {arrival_time_average}")
+
+    # Print some summary statistics
+    print(f"Mean total time: {estimates['mean']:.2f} hours (standard error {errors['mean']:.2f})")
+    print(f"Median total time: {estimates['median']:.2f} hours (standard error {errors['median']:.2f})")
+    print(f"Standard deviation of total time: {estimates['std']:.2f} hours (standard error {errors['std']:.2f})")
+
+    # Print phase-specific times
+    print(f"Mean travel time to base: {total_travel_time_to_base:.2f} hours")
+    print(f"Mean time at base: {np.mean(time_at_base):.2f} hours")
+    print(f"Mean travel time back: {travel_time_to_base:.2f} hours")
+    print(f"Mean total mission time: {np.mean(simulation_results):.2f} hours")
+
+    # Plot the distribution of total times
+    plt.figure(figsize=(12, 8))
+    sns.histplot(simulation_results, bins=50, kde=True)
+    plt.axvline(lower_bound, color='r', linestyle='--', label='5th percentile')
+    plt.axvline(upper_bound, color='g', linestyle='--', label='95th percentile')
+    plt.axvline(average_bound, color='b', linestyle='--', label='average')
+
+    plt.title("Distribution of Total Mission Times")
+    plt.xlabel("Total Time (Hours)")
+    plt.ylabel("Frequency")
+    plt.legend()
+    plt.grid(True)
+    plt.show()
+
+# Without --missions, asks for one mission and plots its distribution; with it, writes the arrival
+# time percentiles of every mission of the file to --output
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the arrival time of missions through the base")
+    parser.add_argument("--missions", help="mission file (CSV), see read_missions")
+    parser.add_argument("--output", default="mission_etas.csv")
+    parser.add_argument("--seed", type=int, default=seed)
+    args = parser.parse_args()
+
+    if args.missions:
+        run_batch(args.missions, args.output, args.seed)
+    else:
+        run_interactive(as_generator(args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import numpy as np
+from datetime import timedelta
+
+from pfe import fitting
+from pfe.datastore import load_table
+
+# Average of durations given in minutes, summed as whole seconds so it is exact
+def average_duration(total_minutes):
+    return timedelta(seconds=int(np.rint(total_minutes * 60).sum())) / len(total_minutes)
+
+# Function to convert timedelta to HH:MM:SS format
+def to_hhmmss(td):
+    total_seconds = int(td.total_seconds())
+    hours, remainder = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f'{hours:02}:{minutes:02}:{seconds:02}'
+
+def main():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Read the CSV file from its columnar cache
+    table = load_table('time_loss_data.csv')
+    columns = table.columns
+
+    # Fit every candidate family to every column at once, spread over the CPUs, with p-values from
+    # a parametric bootstrap of `bootstrap` refitted samples (the KS p-value of parameters fitted
+    # to the same data would be far too optimistic)
+    bootstrap = 1000
+    fits = fitting.fit_datasets(fitting.time_loss_datasets('time_loss_data.csv'), bootstrap=bootstrap, seed=0)
+    best_fits = {}
+    p_values = {}
+    for column, column_fits in fits.items():
+        family = fitting.best_fit(column_fits)
+        best_fits[column] = (family, tuple(column_fits[family]["params"]))
+        p_values[column] = column_fits[family]["p_values"]
+
+    # Calculate the average time for each reason and plot the distribution
+    average_times = {}
+    fig, axes = plt.subplots(nrows=3, ncols=3, figsize=(12, 10))
+
+    for i, column in enumerate(columns):
+        if i >= 9:  # Check if index exceeds the number of subplots
+            break  # Exit the loop if all subplots are filled
+
+        # Times in minutes, empty or zero values filtered out
+        total_minutes = table.minutes(column)
+        total_minutes = total_minutes[total_minutes > 0]
+
+        # Plot the distribution if not empty
+        if len(total_minutes):
+            # Calculate the average time
+            average_time = average_duration(total_minutes)
+            average_times[column] = to_hhmmss(average_time)
+
+            # Create bins of 5-minute intervals
+            max_minutes = int(total_minutes.max()) + 1
+            bins = [x * 5 for x in range(max_minutes // 5 + 1)]
+
+            # Best fit among the candidates fitted above
+            best_fit, best_params = best_fits[column]
+
+            # Plot the distribution
+            sns.histplot(total_minutes, bins=bins, kde=True, ax=axes[i // 3, i % 3])
+            axes[i // 3, i % 3].set_title(f' {column}\nBest fit: {best_fit}', fontsize=10)
+            axes[i // 3, i % 3].set_xlabel('Time (Minutes)', fontsize=8)
+            axes[i // 3, i % 3].set_ylabel('Frequency', fontsize=8)
+            axes[i // 3, i % 3].tick_params(labelsize=6)
+            axes[i // 3, i % 3].grid(True)
+
+    # Adjust layout and spacing
+    plt.subplots_adjust(left=0.1, bottom=0.1, right=0.9, top=0.9, wspace=0.5, hspace=0.5)
+
+    # Show the plot
+    plt.show()
+
+    # Print the average times and best-fit distributions
+    for reason, avg_time in average_times.items():
+        best_fit, best_params = best_fits[reason]
+        params_str = ', '.join(f'{param:.2f}' for param in best_params)
+        p_str = ', '.join(f'{name} {p:.3f}' for name, p in p_values[reason].items())
+        print(f'Average time for {reason}: {avg_time}, Best fit: {best_fit}, Parameters: {params_str}, p-values: {p_str}')
+
+    # Plot the 10th graph in a separate figure
+    if len(columns) >= 10:
+        plt.figure(figsize=(6, 5))
+        total_minutes = table.minutes(columns[9])
+        total_minutes = total_minutes[total_minutes > 0]
+        max_minutes = int(total_minutes.max()) + 1
+        bins = [x * 5 for x in range(max_minutes // 5 + 1)]
+        sns.histplot(total_minutes, bins=bins, kde=True)
+        best_fit, best_params = best_fits[columns[9]]
+        plt.title(f' {columns[9]}\nBest fit: {best_fit}', fontsize=10)
+        plt.xlabel('Time (Minutes)', fontsize=8)
+        plt.ylabel('Frequency', fontsize=8)
+        plt.tick_params(labelsize=6)
+        plt.grid(True)
+        plt.tight_layout()
+        plt.show()
+
+        # Print the best-fit distribution for the 10th graph
+        params_str = ', '.join(f'{param:.2f}' for param in best_params)
+        p_str = ', '.join(f'{name} {p:.3f}' for name, p in p_values[columns[9]].items())
+        print(f'Average time for {columns[9]}: {to_hhmmss(average_time)}, Best fit: {best_fit}, Parameters: {params_str}, p-values: {p_str}')
+
+
+if __name__ == "__main__":
+    main()
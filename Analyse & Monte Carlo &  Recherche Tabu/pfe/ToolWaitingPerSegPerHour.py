@@ -0,0 +1,68 @@
+import pandas as pd
+import numpy as np
+
+from pfe import fitting
+from pfe.goodnessoffit import FAMILIES
+from pfe.datastore import load_table
+
+def main():
+    import matplotlib.pyplot as plt
+
+    # Load the segments and tool waiting times (in hours) from the columnar cache of the CSV file
+    table = load_table('ToolWaitingPerSegPerHour.csv')
+    df = pd.DataFrame({'Seg': table.values('Seg'), 'ToolWaiting_hours': table.minutes('ToolWaiting') / 60})
+
+    # Filter out rows with zero ToolWaiting values
+    df = df[df['ToolWaiting_hours'] > 0]
+
+    # Bin ToolWaiting times into 5-minute intervals
+    bin_width = 5 / 60  # 5 minutes in hours
+    bins = np.arange(0, df['ToolWaiting_hours'].max() + bin_width, bin_width)
+    df['ToolWaiting_binned'] = pd.cut(df['ToolWaiting_hours'], bins, right=False)
+
+    # Fit every candidate family to every segment at once, spread over the CPUs, loc left free
+    datasets = {segment: df[df['Seg'] == segment]['ToolWaiting_hours'] for segment in df['Seg'].unique()}
+    fits = fitting.fit_datasets(datasets, fit_args={segment: fitting.FREE_LOC for segment in datasets})
+
+    # Initialize a dictionary to store the results
+    results = {}
+
+    for segment, segment_fits in fits.items():
+        seg_data = df[df['Seg'] == segment]['ToolWaiting_hours']
+        best_fit = fitting.best_fit(segment_fits)
+        best_params = tuple(segment_fits[best_fit]["params"])
+        best_ks_stat = segment_fits[best_fit]["ks_stat"]
+
+        results[segment] = {
+            'best_fit': best_fit,
+            'params': best_params,
+            'ks_stat': best_ks_stat
+        }
+
+        # Print parameters of the best fit distribution
+        print(f"Segment: {segment}")
+        print(f"Best Fit Distribution: {best_fit}")
+        print(f"Parameters: {best_params}")
+        print(f"KS Statistic: {best_ks_stat}\n")
+
+        # Plot the data and the best fitting distribution
+        plt.figure(figsize=(10, 6))
+        plt.hist(seg_data, bins=bins, density=True, alpha=0.6, color='g', label='Data')
+
+        dist = FAMILIES[best_fit]
+        x = np.linspace(0, seg_data.max(), 1000)
+        if best_fit == 'poisson':
+            x = np.arange(0, seg_data.max() + 1)
+            plt.plot(x, dist.pmf(x, *best_params), 'r-', label=f'{best_fit} fit')
+        else:
+            plt.plot(x, dist.pdf(x, *best_params), 'r-', label=f'{best_fit} fit')
+
+        plt.title(f'Tool Waiting Time Distribution for Segment: {segment}')
+        plt.xlabel('Tool Waiting Time (hours)')
+        plt.ylabel('Density')
+        plt.legend()
+        plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+# Monte Carlo simulation, distribution fitting and tabu search scheduling of the base's loading
+# operations. The modules read their CSV inputs from the working directory (see paramtables.DATA_DIR),
+# run them from the data folder: python -m pfe.level2ExecutionCode
@@ -0,0 +1,142 @@
+import heapq
+from collections import deque
+
+import numpy as np
+
+from pfe.level2ExecutionCode import create_time_segments
+from pfe.level2Montefuction import distributions, probabilities, get_quantiles, EPS
+from pfe.paramtables import tool_waiting_params
+from pfe.sampling import as_generator
+from pfe.schedule import Schedule
+
+# Discrete-event simulation of a whole day at the base. Unlike MontecarloSim, which samples
+# "Crane waiting" and "LiftTruck wait time" as independent delays, trucks here queue for a finite
+# pool of cranes and lift trucks, so waiting comes out of the schedule itself.
+#
+# Each truck arrives uniformly within its time segment, maneuvers, then loads/unloads with a crane
+# or a lift truck (first come, first served), then goes through the delays that need no shared
+# resource (load securement, tool waiting, papers, planification, coordination, other).
+
+CRANE = 0
+LIFT_TRUCK = 1
+
+# Events of the calendar; at equal times a release is handled before a new request
+RELEASE = 0
+REQUEST = 1
+
+# Delays that do not hold a crane or a lift truck, applied after loading/unloading
+FREE_DELAYS = [
+    "LOAD SECUREMENT",
+    "TOOL WAITING",
+    "Administrative papers/authorisations",
+    "Service Planification Delays",
+    "Coordination SEG - DRIVERS",
+    "other delays",
+]
+
+# Share of trucks needing the crane rather than a lift truck, from how often each wait is recorded
+CRANE_SHARE = probabilities["Crane waiting"] / (probabilities["Crane waiting"] + probabilities["LiftTruck wait time"])
+
+
+# One replication: trucks ready for loading/unloading at `ready` (minutes) on `resource`,
+# holding it for `service` minutes. Returns the time each truck starts being served.
+def run_replication(ready, resource, service, capacity):
+    free = list(capacity)
+    queues = [deque() for _ in capacity]
+    start = np.empty(len(ready))
+    calendar = [(t, REQUEST, i) for i, t in enumerate(ready.tolist())]
+    heapq.heapify(calendar)
+    resource = resource.tolist()
+    service = service.tolist()
+
+    while calendar:
+        t, event, i = heapq.heappop(calendar)
+        r = resource[i]
+        if event == REQUEST:
+            if free[r]:
+                free[r] -= 1
+                start[i] = t
+                heapq.heappush(calendar, (t + service[i], RELEASE, i))
+            else:
+                queues[r].append(i)
+        else:
+            if queues[r]:
+                j = queues[r].popleft()
+                start[j] = t
+                heapq.heappush(calendar, (t + service[j], RELEASE, j))
+            else:
+                free[r] += 1
+    return start
+
+
+def zero_inflated(name, dist_name, params, shape, rng):
+    u = rng.random(shape)
+    prob = probabilities[name]
+    durations = get_quantiles(dist_name, params, np.clip(u / prob, EPS, 1 - EPS))
+    return np.where(u < prob, durations, 0.0)
+
+
+# Durations of the free delays of every truck, summed, for each replication (minutes)
+def free_delays(arrival_hours, bls, shape, rng):
+    total = np.zeros(shape)
+    for name in FREE_DELAYS:
+        dist_name, params = distributions[name]
+        if name == "TOOL WAITING":
+            tool = np.zeros(shape)
+            for i, (hour, bl) in enumerate(zip(arrival_hours, bls)):
+                tool_params = tool_waiting_params(hour, bl)
+                if tool_params is not None:
+                    mean_waiting, std_dev_waiting = tool_params
+                    occurs = rng.random(shape[0]) < probabilities[name]
+                    tool[:, i] = np.where(occurs, rng.normal(mean_waiting, std_dev_waiting, shape[0]), 0.0)
+            total += tool
+        else:
+            total += zero_inflated(name, dist_name, params, shape, rng)
+    return total
+
+
+# Simulate a day's schedule (a Schedule or its DataFrame) `replications` times.
+# Returns, for each replication and truck, the arrival, the wait for a crane or lift truck and the
+# completion time, in minutes since midnight. rng: np.random.Generator (or seed) of the draws.
+def simulate_day(schedule, replications=1000, n_cranes=1, n_lift_trucks=2, crane_share=CRANE_SHARE, rng=None):
+    rng = as_generator(rng)
+    time_segments = create_time_segments()
+    if not isinstance(schedule, Schedule):
+        schedule = Schedule.from_dataframe(schedule, time_segments)
+    slot_starts = np.array([time_segments[slot][0] for slot in schedule.slots], dtype=float)
+    slot_ends = np.array([time_segments[slot][1] for slot in schedule.slots], dtype=float)
+    shape = (replications, len(schedule))
+    capacity = [n_cranes, n_lift_trucks]
+
+    # Everything random is drawn for all replications up front
+    arrival = slot_starts + (slot_ends - slot_starts) * rng.random(shape)
+    maneuvering = zero_inflated("Base maneuvering time", *distributions["Base maneuvering time"], shape, rng)
+    resource = np.where(rng.random(shape) < crane_share, CRANE, LIFT_TRUCK)
+    service = zero_inflated("load/unloading time", *distributions["load/unloading time"], shape, rng)
+    after = free_delays((slot_starts // 60).astype(int), schedule.trucks.bls, shape, rng)
+
+    ready = arrival + maneuvering
+    start = np.empty(shape)
+    for k in range(replications):
+        start[k] = run_replication(ready[k], resource[k], service[k], capacity)
+
+    return {
+        "truck_id": schedule.trucks.truck_ids,
+        "arrival": arrival,
+        "waiting": start - ready,
+        "completion": start + service + after,
+        "resource": resource,
+    }
+
+
+# Per-truck summary of simulate_day: mean wait and 50th/95th percentile of the completion time
+def summarize_day(result):
+    import pandas as pd
+
+    return pd.DataFrame({
+        "truck_id": list(result["truck_id"]),
+        "MeanWaiting": result["waiting"].mean(axis=0),
+        "P95Waiting": np.percentile(result["waiting"], 95, axis=0),
+        "MedianCompletion": np.median(result["completion"], axis=0),
+        "P95Completion": np.percentile(result["completion"], 95, axis=0),
+    })
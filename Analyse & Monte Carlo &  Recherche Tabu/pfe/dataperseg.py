@@ -0,0 +1,98 @@
+import pandas as pd
+import numpy as np
+
+from pfe.datastore import load_table
+
+HOUR = pd.Timedelta(hours=1)
+
+
+# Number of vehicles at the base for every segment, day and hour, from the entry/exit times of df.
+# A vehicle counts in every clock hour from the one it enters in up to (not including) the hour
+# boundary following its exit. A visit whose exit is before its entry crossed midnight and counts
+# on the next day too; hours falling on a day without any entry in the data are dropped.
+# Each visit adds +1 at its first hour and -1 after its last one on an hourly timeline per segment,
+# and the cumulative sum of that timeline gives the counts, with no loop over visits or hours.
+# Returns the counts as a (1 + number of segments, number of days, 24) array, row 0 being 'All',
+# the segments and the days (both in order of first appearance); an empty frame gives a
+# (1, 0, 24) array with no segments and no days.
+def hourly_occupancy(df):
+    if df.empty:
+        return np.zeros((1, 0, 24), dtype=np.int64), [], []
+    entry_time = df['entry_time']
+    exit_time = df['exit_time'].where(df['exit_time'] >= entry_time, df['exit_time'] + pd.Timedelta(days=1))
+
+    day_codes, days = pd.factorize(entry_time.dt.normalize())
+    segment_codes, segments = pd.factorize(df['Seg'])
+
+    # Timeline of hours from midnight of the first day, one extra day for visits crossing midnight
+    first_day = days.min()
+    n_calendar_days = (days.max() - first_day).days + 2
+    n_hours = n_calendar_days * 24
+    start = ((entry_time.dt.floor('h') - first_day) // HOUR).to_numpy()
+    end = ((exit_time.dt.ceil('h') - first_day) // HOUR).to_numpy()
+    end = np.maximum(end, start)
+
+    n_segments = len(segments)
+    width = n_hours + 1
+    changes = np.bincount(segment_codes * width + start, minlength=n_segments * width)
+    changes -= np.bincount(segment_codes * width + end, minlength=n_segments * width)
+    timeline = np.cumsum(changes.reshape(n_segments, width), axis=1)[:, :n_hours]
+
+    # Back from the calendar to the days of the data, in order of first appearance
+    calendar_rows = ((days - first_day) // pd.Timedelta(days=1)).to_numpy()
+    counts = timeline.reshape(n_segments, n_calendar_days, 24)[:, calendar_rows]
+    counts = np.concatenate([counts.sum(axis=0, keepdims=True), counts])
+    return counts, list(segments), [day.date() for day in days]
+
+
+def main():
+    # Load the CSV file from its columnar cache
+    table = load_table('PerSegPerTime.csv')
+
+    # Combine Date and Entry/Exit to form datetime objects: each distinct date label is parsed
+    # once, and the times are already in minutes
+    date_codes, date_labels = table.codes('Date')
+    dates = pd.to_datetime(pd.Series(date_labels), format='%d-%b').to_numpy()[date_codes]
+    df = pd.DataFrame({'Seg': table.values('Seg')})
+    df['entry_time'] = dates + pd.to_timedelta(table.minutes('Entry'), unit='min')
+    df['exit_time'] = dates + pd.to_timedelta(table.minutes('Exit'), unit='min')
+
+    vehicle_counts, segments, days = hourly_occupancy(df)
+    keys = ['All'] + segments
+
+    # Statistics over the days for each segment and hour of the day, the days laid out contiguously
+    # so the sums run in the same order (and give the same last digits) as over a list of days
+    hourly_counts = np.ascontiguousarray(vehicle_counts.transpose(0, 2, 1))
+    result_df = pd.DataFrame({
+        'Hour': np.tile(np.arange(24), len(keys)),
+        'Segment': np.repeat(keys, 24),
+        'Average': hourly_counts.mean(axis=2).ravel(),
+        'Median': np.median(hourly_counts, axis=2).ravel(),
+        'StdDev': hourly_counts.std(axis=2).ravel(),
+    })
+
+    # Save the results to a CSV file
+    result_df.to_csv('ExportedTimePerSegPreHour.csv', index=False)
+
+    # Print the results
+    print("Statistics for each segment and hour of the day:")
+    print(result_df)
+
+    # One row per segment, day and hour
+    vehicle_counts_df = pd.DataFrame({
+        'Segment': np.repeat(keys, len(days) * 24),
+        'Date': np.tile(np.repeat(np.array(days, dtype=object), 24), len(keys)),
+        'Hour': np.tile(np.arange(24), len(keys) * len(days)),
+        'Count': vehicle_counts.ravel(),
+    })
+
+    # Save vehicle counts to a CSV file
+    vehicle_counts_df.to_csv('NBTruckPerDay.csv', index=False)
+
+    # Print vehicle counts
+    print("Vehicle counts per segment, day, and hour:")
+    print(vehicle_counts_df)
+
+
+if __name__ == "__main__":
+    main()
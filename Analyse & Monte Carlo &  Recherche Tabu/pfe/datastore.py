@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+
+# Columnar cache of the project's CSV files. Each source is parsed once into one .npy file per
+# column, kept in a .csvcache directory next to it, and later loads memory-map those arrays
+# instead of parsing text. Column types are inferred from the text:
+#   minutes   "H:MM" or "HH:MM:SS" times (and "0"), as integer minutes
+#   seconds   the same when some times have seconds, as integer seconds
+#   int/float numbers
+#   category  anything else, as integer codes into a list of labels
+# Missing times and categories are stored as MISSING. A cache whose source changed size or
+# modification time is checked against the source's hash and rebuilt if the content changed.
+# Loading a cached table only needs NumPy; pandas is imported to (re)build a cache or a frame.
+
+CACHE_DIR = ".csvcache"
+
+# Layout of the cache, bumped when it changes so older caches are rebuilt
+CACHE_FORMAT = 1
+
+MISSING = -1
+
+TIME_PATTERN = re.compile(r"^(\d+):(\d{2})(?::(\d{2}))?$|^0$")
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# File object writing to a temporary file next to path, moved over path once the block succeeds,
+# so an interrupted run never leaves a truncated file behind and readers see the old or new one
+@contextmanager
+def atomic_write(path, mode="w"):
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as file:
+            yield file
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def cache_directory(path):
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR, os.path.basename(path))
+
+
+# Typed array (and labels, for a category) of one column of strings, missing cells being NaN
+def encode_column(values):
+    import pandas as pd
+
+    present = values.notna().to_numpy()
+    text = values[present].str.strip()
+
+    parts = text.str.extract(TIME_PATTERN)
+    if len(text) and parts[0].notna().eq(text != "0").all():
+        hours, minutes, seconds = (parts[k].fillna("0").astype(np.int64).to_numpy() for k in range(3))
+        array = np.full(len(values), MISSING, dtype=np.int64)
+        if seconds.any():
+            array[present] = (hours * 60 + minutes) * 60 + seconds
+            return "seconds", array, None
+        array[present] = hours * 60 + minutes
+        return "minutes", array, None
+
+    numbers = pd.to_numeric(text, errors="coerce")
+    if len(text) and numbers.notna().all():
+        if present.all() and text.str.fullmatch(r"[-+]?\d+").all():
+            return "int", numbers.to_numpy(dtype=np.int64), None
+        array = np.full(len(values), np.nan)
+        array[present] = numbers.to_numpy(dtype=float)
+        return "float", array, None
+
+    codes, labels = pd.factorize(values)
+    return "category", codes.astype(np.int32), [str(label) for label in labels]
+
+
+# Build the cache in a directory of this process's own, then move it into place. Processes loading
+# the same file at once each build a copy: the first one moved in wins, the others discard theirs.
+def build_cache(path, directory, source):
+    import pandas as pd
+
+    data = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+    cache_root = os.path.dirname(directory)
+    os.makedirs(cache_root, exist_ok=True)
+    tmp_directory = tempfile.mkdtemp(dir=cache_root, prefix=os.path.basename(directory) + ".", suffix=".tmp")
+    try:
+        columns = []
+        for i, name in enumerate(data.columns):
+            kind, array, labels = encode_column(data[name])
+            np.save(os.path.join(tmp_directory, f"{i}.npy"), array)
+            columns.append({"name": name, "kind": kind, "labels": labels})
+        with atomic_write(os.path.join(tmp_directory, "meta.json")) as file:
+            json.dump({"format": CACHE_FORMAT, "source": source, "rows": len(data), "columns": columns}, file)
+        move_into_place(tmp_directory, directory, source["sha256"])
+    finally:
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+
+
+# Move the built cache tmp_directory to directory, unless another process already put a cache of
+# the same content there. An outdated cache in the way is first moved aside, then deleted.
+def move_into_place(tmp_directory, directory, content_hash):
+    for _ in range(3):
+        try:
+            os.replace(tmp_directory, directory)
+            return
+        except OSError:
+            meta = read_meta(directory)
+            if meta is not None and meta["source"]["sha256"] == content_hash:
+                return
+            stale_directory = tmp_directory + ".old"
+            try:
+                os.replace(directory, stale_directory)
+            except FileNotFoundError:
+                pass
+            shutil.rmtree(stale_directory, ignore_errors=True)
+    raise OSError(f"could not move the cache of {os.path.basename(directory)} into {os.path.dirname(directory)}")
+
+
+# Size, modification time and content hash of the source file
+def source_state(path, content_hash=None):
+    stat = os.stat(path)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": content_hash if content_hash is not None else file_hash(path),
+    }
+
+
+def read_meta(directory):
+    try:
+        with open(os.path.join(directory, "meta.json")) as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("format") == CACHE_FORMAT else None
+
+
+# Load the CSV at path from its columnar cache, building (or rebuilding) the cache first if needed
+def load_table(path):
+    directory = cache_directory(path)
+    meta = read_meta(directory)
+    stat = os.stat(path)
+    if meta is None or (meta["source"]["size"], meta["source"]["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+        content_hash = file_hash(path)
+        if meta is not None and meta["source"]["sha256"] == content_hash:
+            # Touched but unchanged: only the recorded modification time is out of date
+            meta["source"] = source_state(path, content_hash)
+            with atomic_write(os.path.join(directory, "meta.json")) as file:
+                json.dump(meta, file)
+        else:
+            build_cache(path, directory, source_state(path, content_hash))
+            meta = read_meta(directory)
+    return CachedTable(directory, meta)
+
+
+class CachedTable:
+
+    def __init__(self, directory, meta):
+        self.directory = directory
+        self.rows = meta["rows"]
+        self.source = meta["source"]
+        self.columns = [column["name"] for column in meta["columns"]]
+        self.kinds = {column["name"]: column["kind"] for column in meta["columns"]}
+        self.labels = {column["name"]: column["labels"] for column in meta["columns"]}
+        self.files = {column["name"]: os.path.join(directory, f"{i}.npy") for i, column in enumerate(meta["columns"])}
+
+    def __len__(self):
+        return self.rows
+
+    # Stored array of a column, memory-mapped
+    def array(self, name):
+        return np.load(self.files[name], mmap_mode="r")
+
+    # Times of a column in minutes (float, NaN where missing)
+    def minutes(self, name):
+        array = np.asarray(self.array(name))
+        if self.kinds[name] not in ("minutes", "seconds"):
+            raise ValueError(f"{name} is not a time column")
+        unit = 60 if self.kinds[name] == "seconds" else 1
+        return np.where(array == MISSING, np.nan, array / unit)
+
+    # Category codes of a column and its labels
+    def codes(self, name):
+        if self.kinds[name] != "category":
+            raise ValueError(f"{name} is not a category column")
+        return np.asarray(self.array(name)), self.labels[name]
+
+    # Values of a column: labels for categories (None where missing), minutes for times
+    def values(self, name):
+        kind = self.kinds[name]
+        if kind == "category":
+            codes, labels = self.codes(name)
+            return np.append(np.array(labels, dtype=object), None)[codes]
+        if kind in ("minutes", "seconds"):
+            return self.minutes(name)
+        return np.asarray(self.array(name))
+
+    def frame(self):
+        import pandas as pd
+
+        return pd.DataFrame({name: self.values(name) for name in self.columns})
@@ -0,0 +1,395 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from pfe.FullCodeLVL1 import ETA_PERCENTILES, check_distances, destination_arrivals, mission_arrivals, simulate_base_time
+from pfe.level2Montefuction import distributions, simulate_time_at_base
+from pfe.paramtables import HOURS, SEGMENTS
+from pfe.samplebank import SampleBank
+from pfe.simcache import SimulationCache
+
+# Local HTTP service answering mission ETA and time-at-base queries from one long-lived process.
+# Everything a query needs is prepared once at startup: the parameter tables are loaded, the
+# percentiles of the time at the base of a mission are simulated for every arrival hour and
+# segment, and a bank of uniforms is drawn for the time-at-base simulations, whose results are
+# cached, the usual truck counts being simulated right away. Requests arriving together are
+# answered together: each kind of query goes through a queue, and everything queued when the
+# previous batch finishes is computed in one vectorized pass. Only the standard library's asyncio
+# is used, over TCP or a Unix socket:
+#     POST /eta            {"missions": [{"distance_to_md1": 120, "distance_to_base": 40, "segment": "DNM", "start": "2024-03-04 07:30"}, ...]}
+#     POST /time-at-base   {"queries": [{"arrival_hour": 10, "num_trucks": 3, "segment": "WL"}, ...]}
+#     GET  /health
+# A single mission or query can also be posted on its own, without the list around it.
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+# Uniforms per time-at-base simulation
+TIME_AT_BASE_SAMPLES = 4096
+
+# Time-at-base queries simulated at startup: every hour and segment with up to this many trucks
+WARM_TRUCKS = 12
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+# Calls process(items) on everything submitted while the previous call was running, so concurrent
+# requests share one computation. process returns one result per item. If a batch fails, its items
+# are processed again one by one, so only the requests that fail on their own get the error.
+class RequestBatcher:
+
+    def __init__(self, process):
+        self.process = process
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((item, future))
+        return await future
+
+    async def run(self):
+        while True:
+            batch = [await self.queue.get()]
+            # Let the requests that are already readable enqueue theirs before computing
+            await asyncio.sleep(0)
+            while not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            self.batches += 1
+            self.items += len(batch)
+            try:
+                results = self.process([item for item, _ in batch])
+            except Exception:
+                for item, future in batch:
+                    self.resolve(future, lambda: self.process([item])[0])
+            else:
+                for (_, future), result in zip(batch, results):
+                    self.resolve(future, lambda: result)
+
+    # Set the future to compute()'s result, or to the exception it raises
+    @staticmethod
+    def resolve(future, compute):
+        if future.cancelled():
+            return
+        try:
+            future.set_result(compute())
+        except Exception as error:
+            future.set_exception(error)
+
+
+def as_list(payload, key):
+    return payload[key] if isinstance(payload, dict) and key in payload else [payload]
+
+
+# (start, distance_to_md1, distance_to_base, segment code) arrays of the missions of a request, checked
+def parse_missions(payload):
+    missions = as_list(payload, "missions")
+    if not missions:
+        raise ValueError("no missions")
+    segments = [mission["segment"] for mission in missions]
+    unknown = [segment for segment in segments if segment not in SEGMENTS[1:]]
+    if unknown:
+        raise ValueError(f"unknown segment(s) {unknown}, expected one of {SEGMENTS[1:]}")
+    start = np.array([mission["start"].replace(" ", "T") for mission in missions], dtype="datetime64[us]")
+    if np.isnat(start).any():
+        raise ValueError("missing start")
+    distance_to_md1 = np.array([mission["distance_to_md1"] for mission in missions], dtype=float)
+    distance_to_base = np.array([mission["distance_to_base"] for mission in missions], dtype=float)
+    check_distances(distance_to_md1, "distance_to_md1")
+    check_distances(distance_to_base, "distance_to_base")
+    segment_codes = np.array([SEGMENTS.index(segment) for segment in segments], dtype=int)
+    return start, distance_to_md1, distance_to_base, segment_codes
+
+
+# (arrival hour, number of trucks, segment) of each query of a request, checked. The arrival is
+# given as an hour of the day or as a "YYYY-MM-DD HH:MM" datetime.
+def parse_time_at_base_queries(payload):
+    queries = []
+    payload_queries = as_list(payload, "queries")
+    if not payload_queries:
+        raise ValueError("no queries")
+    for query in payload_queries:
+        if "arrival_hour" in query:
+            hour = int(query["arrival_hour"])
+        else:
+            hour = np.datetime64(query["arrival"].replace(" ", "T"), "m").item().hour
+        if not 0 <= hour < HOURS:
+            raise ValueError(f"arrival hour {hour} out of range")
+        num_trucks = int(query["num_trucks"])
+        if num_trucks < 0:
+            raise ValueError(f"negative number of trucks {num_trucks}")
+        segment = query["segment"]
+        if segment not in SEGMENTS[1:]:
+            raise ValueError(f"unknown segment {segment!r}, expected one of {SEGMENTS[1:]}")
+        queries.append((hour, num_trucks, segment))
+    return queries
+
+
+class EtaService:
+
+    def __init__(self, n_samples=TIME_AT_BASE_SAMPLES, seed=None, warm_trucks=WARM_TRUCKS):
+        rng = np.random.default_rng(seed)
+
+        # Percentiles of the time at the base (hours) of a mission, by arrival hour and segment
+        self.base_time_percentiles = np.zeros((HOURS, len(SEGMENTS), len(ETA_PERCENTILES)))
+        for hour in range(HOURS):
+            for code, segment in enumerate(SEGMENTS[1:], start=1):
+                time_at_base, _, _ = simulate_base_time(hour, segment, rng)
+                self.base_time_percentiles[hour, code] = np.percentile(time_at_base, ETA_PERCENTILES)
+
+        self.bank = SampleBank(n_samples, len(distributions), int(rng.integers(2**63 - 1)))
+        self.time_at_base_cache = SimulationCache()
+        self.times_at_base([[
+            (hour, num_trucks, segment)
+            for hour in range(HOURS) for num_trucks in range(warm_trucks + 1) for segment in SEGMENTS[1:]
+        ]])
+        # Hits and misses count queries only
+        self.time_at_base_cache.hits = 0
+        self.time_at_base_cache.misses = 0
+        self.eta_batcher = RequestBatcher(self.mission_etas)
+        self.time_at_base_batcher = RequestBatcher(self.times_at_base)
+        self.requests = 0
+        self.started = time.time()
+
+    # ETAs of a batch of requests, each the parsed missions of one request
+    def mission_etas(self, requests):
+        start, distance_to_md1, distance_to_base, segment_codes = (np.concatenate(arrays) for arrays in zip(*requests))
+        arrival_time_at_base = mission_arrivals(start, distance_to_md1)
+        arrival_hours = (arrival_time_at_base - arrival_time_at_base.astype("datetime64[D]")) // np.timedelta64(1, "h")
+        etas = destination_arrivals(
+            start, arrival_time_at_base, self.base_time_percentiles[arrival_hours, segment_codes], distance_to_base
+        )
+
+        arrival_strings = np.datetime_as_string(arrival_time_at_base, unit="s")
+        eta_strings = np.datetime_as_string(etas, unit="s")
+        missions = [
+            dict(arrival_at_base=arrival, **{f"eta_p{p}": eta for p, eta in zip(ETA_PERCENTILES, mission_etas)})
+            for arrival, mission_etas in zip(arrival_strings.tolist(), eta_strings.tolist())
+        ]
+        bounds = np.cumsum([0] + [len(request[0]) for request in requests])
+        return [missions[low:high] for low, high in zip(bounds[:-1], bounds[1:])]
+
+    # Median and standard deviation of the time at the base (hours), as MontecarloSim computes them,
+    # for a batch of requests, each a list of (hour, number of trucks, segment). The queries not in
+    # the cache are simulated on the bank, one simulation per (hour, segment) with every truck
+    # count stacked in it.
+    def times_at_base(self, requests):
+        results = {}
+        missing = {}
+        for query in dict.fromkeys(query for queries in requests for query in queries):
+            results[query] = self.time_at_base_cache.get(query)
+            if results[query] is None:
+                hour, num_trucks, segment = query
+                missing.setdefault((hour, segment), []).append(num_trucks)
+
+        n = len(self.bank)
+        for (hour, segment), truck_counts in missing.items():
+            u = np.tile(self.bank.uniforms, (len(truck_counts), 1))
+            num_trucks_at_base = np.repeat(truck_counts, n)
+            times = (simulate_time_at_base(hour, num_trucks_at_base, segment, u) / 60).reshape(len(truck_counts), n)
+            medians = np.percentile(times, 50, axis=1)
+            stds = np.std(times, axis=1)
+            for num_trucks, median, std in zip(truck_counts, medians.tolist(), stds.tolist()):
+                results[hour, num_trucks, segment] = {"median": median, "std": std}
+                self.time_at_base_cache.put((hour, num_trucks, segment), results[hour, num_trucks, segment])
+
+        return [[results[query] for query in queries] for queries in requests]
+
+    def health(self):
+        return {
+            "uptime_seconds": time.time() - self.started,
+            "requests": self.requests,
+            "eta_batches": self.eta_batcher.batches,
+            "eta_requests": self.eta_batcher.items,
+            "time_at_base_batches": self.time_at_base_batcher.batches,
+            "time_at_base_requests": self.time_at_base_batcher.items,
+            "time_at_base_cache": self.time_at_base_cache.stats(),
+        }
+
+    # (status, JSON payload) of one request
+    async def dispatch(self, method, path, body):
+        self.requests += 1
+        if path == "/health":
+            return 200, self.health()
+        routes = {
+            "/eta": (parse_missions, self.eta_batcher, "missions"),
+            "/time-at-base": (parse_time_at_base_queries, self.time_at_base_batcher, "results"),
+        }
+        if path not in routes:
+            return 404, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": f"{path} expects POST"}
+        parse, batcher, key = routes[path]
+        try:
+            item = parse(json.loads(body))
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            return 400, {"error": f"{type(error).__name__}: {error}"}
+        try:
+            result = await batcher.submit(item)
+        except Exception as error:
+            return 500, {"error": f"{type(error).__name__}: {error}"}
+        return 200, {key: result}
+
+    # HTTP/1.1 over one connection, kept open between requests unless the client asks otherwise
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self.dispatch(method, target.split("?", 1)[0], body)
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    # Start the batchers and listen on host:port, or on the Unix socket at path if given
+    async def start(self, host=HOST, port=PORT, path=None):
+        self.tasks = [asyncio.create_task(self.eta_batcher.run()), asyncio.create_task(self.time_at_base_batcher.run())]
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, path=path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+# Minimal client keeping one connection open, for tests and the load test below
+class EtaClient:
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host=HOST, port=PORT, path=None):
+        if path is not None:
+            return cls(*await asyncio.open_unix_connection(path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    # (status, JSON payload) of the response
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if not line.strip():
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+# Random single-mission and single-query requests, alternating
+def load_test_requests(n_requests, rng):
+    requests = []
+    for i in range(n_requests):
+        segment = str(rng.choice(SEGMENTS[1:]))
+        if i % 2 == 0:
+            start = np.datetime64("2024-03-04T00:00") + np.timedelta64(int(rng.integers(2 * 24 * 60)), "m")
+            mission = {
+                "distance_to_md1": float(rng.uniform(10, 600)),
+                "distance_to_base": float(rng.uniform(5, 200)),
+                "segment": segment,
+                "start": str(start),
+            }
+            requests.append(("/eta", mission))
+        else:
+            query = {"arrival_hour": int(rng.integers(8, 17)), "num_trucks": int(rng.integers(0, 10)), "segment": segment}
+            requests.append(("/time-at-base", query))
+    return requests
+
+
+# Start a service on localhost and query it from `clients` concurrent connections, each sending
+# `requests` requests one after the other. Returns the latencies (seconds) and the service health.
+async def load_test(clients=20, requests=200, port=0, path=None, n_samples=TIME_AT_BASE_SAMPLES, seed=0):
+    service = EtaService(n_samples, seed)
+    server = await service.start(HOST, port, path)
+    if path is None:
+        port = server.sockets[0].getsockname()[1]
+    rng = np.random.default_rng(seed)
+    latencies = []
+
+    async def client(client_requests):
+        connection = await EtaClient.connect(HOST, port, path)
+        for route, payload in client_requests:
+            start = time.perf_counter()
+            status, _ = await connection.request("POST", route, payload)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError(f"{route} answered {status}")
+        await connection.close()
+
+    async with server:
+        await asyncio.gather(*(client(load_test_requests(requests, rng)) for _ in range(clients)))
+    return np.array(latencies), service.health()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve mission ETA and time-at-base queries on localhost")
+    parser.add_argument("command", nargs="?", choices=["serve", "load-test"], default="serve")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--unix", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--samples", type=int, default=TIME_AT_BASE_SAMPLES)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client of the load test")
+    args = parser.parse_args()
+
+    if args.command == "load-test":
+        latencies, health = asyncio.run(load_test(args.clients, args.requests, 0, args.unix, args.samples, args.seed))
+        latencies *= 1000
+        print(f"{len(latencies)} requests from {args.clients} clients")
+        print(f"latency p50 {np.percentile(latencies, 50):.2f} ms, p99 {np.percentile(latencies, 99):.2f} ms, max {latencies.max():.2f} ms")
+        for name, value in health.items():
+            print(f"{name}: {value}")
+        return
+
+    async def serve():
+        started = time.perf_counter()
+        service = EtaService(args.samples, args.seed)
+        server = await service.start(args.host, args.port, args.unix)
+        where = args.unix or f"http://{args.host}:{args.port}"
+        print(f"Serving on {where} (ready in {time.perf_counter() - started:.1f} s)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import numpy as np
+from scipy import fft
+from scipy.special import ndtr, ndtri
+
+from pfe.level2Montefuction import distributions, probabilities, base_maneuvering_scale, get_quantiles
+from pfe.paramtables import tool_waiting_params
+
+# Distribution of the total time at the base without sampling: every event is a zero-inflated
+# lognorm/expon/weibull_min (or normal for the hourly tool waiting), discretized on a common grid of
+# `step` minutes, and the independent events are summed by multiplying their FFTs.
+
+
+# CDF of each distribution, written with NumPy (freezing scipy.stats objects costs more than
+# the whole convolution)
+def get_cdf(dist_name, params, x):
+    if dist_name == "lognorm":
+        s, loc, scale = params
+        z = np.log(np.maximum(x - loc, 1e-300) / scale) / s
+        return np.where(x > loc, ndtr(z), 0.0)
+    elif dist_name == "expon":
+        loc, scale = params
+        return np.where(x > loc, -np.expm1(-(x - loc) / scale), 0.0)
+    elif dist_name == "weibull_min":
+        c, loc, scale = params
+        return np.where(x > loc, -np.expm1(-(np.maximum(x - loc, 0) / scale) ** c), 0.0)
+    elif dist_name == "norm":
+        loc, scale = params
+        return ndtr((x - loc) / scale)
+    else:
+        raise ValueError("Unknown distribution")
+
+# Range outside of which each distribution has less than `tail` of its mass
+def get_support(dist_name, params, tail):
+    if dist_name == "norm":
+        loc, scale = params
+        return loc + scale * ndtri(tail), loc - scale * ndtri(tail)
+    return params[-2], get_quantiles(dist_name, params, 1 - tail)
+
+
+# Probability mass of an event on the grid: bin k holds the mass of [(k - 1/2) step, (k + 1/2) step),
+# the first and last bins also hold the tails beyond `tail`, and the bin of 0 holds 1 - prob.
+# Returns the index of the first bin and the masses.
+def discretize(dist_name, params, prob, step, tail=1e-9):
+    if dist_name == "norm" and params[1] == 0:
+        # Normal with no spread: all the mass on its mean
+        k = int(round(params[0] / step))
+        first = min(k, 0)
+        pmf = np.zeros(abs(k) + 1)
+        pmf[k - first] += prob
+        pmf[-first] += 1 - prob
+        return first, pmf
+
+    lower, upper = get_support(dist_name, params, tail)
+    first = min(int(np.floor(lower / step)), 0)
+    last = max(int(np.ceil(upper / step)), 0)
+    edges = (np.arange(first, last + 2) - 0.5) * step
+    cdf = get_cdf(dist_name, params, edges)
+    mass = np.diff(cdf)
+    mass[0] += cdf[0]
+    mass[-1] += 1 - cdf[-1]
+    pmf = prob * mass
+    pmf[-first] += 1 - prob
+    return first, pmf
+
+
+# The events of MontecarloSim as (dist_name, params, prob). num_trucks_at_base is a count or a
+# {count: probability} dict, in which case the base maneuvering time is the matching mixture.
+# With arrival_hour=None the static distributions are used for every event (montecarlopart2lvl1).
+def components(arrival_hour, num_trucks_at_base, segment):
+    result = []
+    for name, (dist_name, params) in distributions.items():
+        prob = probabilities[name]
+        if arrival_hour is None:
+            result.append((dist_name, params, prob))
+        elif name == "Base maneuvering time":
+            if isinstance(num_trucks_at_base, dict):
+                mixture = [
+                    (("lognorm", (0.77, 0.0, float(base_maneuvering_scale(n))), prob), weight)
+                    for n, weight in num_trucks_at_base.items()
+                ]
+                result.append(("mixture", mixture, prob))
+            else:
+                result.append(("lognorm", (0.77, 0.0, float(base_maneuvering_scale(num_trucks_at_base))), prob))
+        elif name == "TOOL WAITING":
+            tool_params = tool_waiting_params(arrival_hour, segment)
+            if tool_params is not None:
+                result.append(("norm", tuple(float(p) for p in tool_params), prob))
+        else:
+            result.append((dist_name, params, prob))
+    return result
+
+
+def discretize_component(component, step, tail):
+    dist_name, params, prob = component
+    if dist_name != "mixture":
+        return discretize(dist_name, params, prob, step, tail)
+    parts = [(discretize(*part, step, tail), weight) for part, weight in params]
+    first = min(part_first for (part_first, _), _ in parts)
+    last = max(part_first + len(pmf) for (part_first, pmf), _ in parts)
+    pmf = np.zeros(last - first)
+    for (part_first, part_pmf), weight in parts:
+        pmf[part_first - first:part_first - first + len(part_pmf)] += weight * part_pmf
+    return first, pmf
+
+
+class TimeAtBaseDistribution:
+
+    # first: grid index of pmf[0], the grid being k * step minutes
+    def __init__(self, first, pmf, step):
+        self.step = step
+        self.pmf = pmf
+        self.minutes = (first + np.arange(len(pmf))) * step
+        self.cdf = np.cumsum(pmf)
+
+    def mean(self):
+        return np.dot(self.minutes, self.pmf)
+
+    def std(self):
+        mean = self.mean()
+        return np.sqrt(np.dot((self.minutes - mean) ** 2, self.pmf))
+
+    # Time (minutes) below which q percent of the missions fall, interpolated within the grid bins
+    def percentile(self, q):
+        edges = np.concatenate([[self.minutes[0] - self.step / 2], self.minutes + self.step / 2])
+        return np.interp(np.asarray(q) / 100, np.concatenate([[0.0], self.cdf]), edges)
+
+    def median(self):
+        return self.percentile(50)
+
+
+# Exact distribution of the total time at the base (minutes) for one arrival hour,
+# number of trucks (or {count: probability}) and segment
+def time_at_base_distribution(arrival_hour, num_trucks_at_base, segment, step=0.5, tail=1e-9):
+    pmfs = [discretize_component(component, step, tail) for component in components(arrival_hour, num_trucks_at_base, segment)]
+    first = sum(component_first for component_first, _ in pmfs)
+    size = sum(len(pmf) for _, pmf in pmfs) - len(pmfs) + 1
+    n_fft = fft.next_fast_len(size, real=True)
+
+    spectrum = np.ones(n_fft // 2 + 1, dtype=complex)
+    for _, pmf in pmfs:
+        spectrum *= fft.rfft(pmf, n_fft)
+    pmf = np.clip(fft.irfft(spectrum, n_fft)[:size], 0, None)
+    return TimeAtBaseDistribution(first, pmf / pmf.sum(), step)
+
+
+# Same (median, std) contract as MontecarloSim, in hours, with no sampling noise
+def ExactSim(arrival_time_at_base, num_trucks_at_base, segment):
+    distribution = time_at_base_distribution(arrival_time_at_base.hour, num_trucks_at_base, segment)
+    return distribution.median() / 60, distribution.std() / 60
@@ -0,0 +1,226 @@
+import argparse
+import datetime
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pfe import paramtables
+from pfe.datastore import atomic_write, load_table
+
+# One fitting engine for every duration of the study: each dataset (a time-loss column, the tool
+# waiting of a segment, ...) is fitted with every candidate family, all fits running in parallel,
+# and the results are kept in a versioned JSON registry that the simulators load at startup.
+# A dataset whose content hash has not changed since the registry was written is not refitted.
+
+# Registry file, in the data folder (paramtables.DATA_DIR)
+REGISTRY_PATH = "distribution_registry.json"
+
+# Layout of the registry file, bumped when it changes
+REGISTRY_FORMAT = 1
+
+# Candidate families (scipy.stats names, see goodnessoffit.FAMILIES) and the arguments of their
+# fit: durations start at 0, so lognorm and weibull_min are fitted with loc fixed there. Poisson
+# has no fit, its rate is the mean. The maximum likelihood fits themselves are the vectorized ones
+# of goodnessoffit.fit_params, which is only imported (with SciPy) once something gets fitted.
+CANDIDATES = {
+    "norm": {},
+    "expon": {},
+    "lognorm": {"floc": 0},
+    "weibull_min": {"floc": 0},
+    "poisson": None,
+}
+
+# Fit arguments leaving loc free, as scipy.stats fits by default; per dataset, these replace the
+# ones of CANDIDATES (see fit_datasets)
+FREE_LOC = {"lognorm": {}, "weibull_min": {}}
+
+# Families the simulators can sample (level2Montefuction.get_quantiles)
+SIMULATED_FAMILIES = ["lognorm", "expon", "weibull_min"]
+
+
+# Durations in minutes of every column of time_loss_data.csv, empty and zero cells left out
+def time_loss_datasets(file_path="time_loss_data.csv"):
+    table = load_table(file_path)
+    datasets = {}
+    for column in table.columns:
+        minutes = table.minutes(column)
+        minutes = minutes[minutes > 0]
+        if len(minutes):
+            datasets[column] = minutes
+    return datasets
+
+
+# Non-zero tool waiting times in hours for each segment of ToolWaitingPerSegPerHour.csv
+def tool_waiting_datasets(file_path="ToolWaitingPerSegPerHour.csv"):
+    table = load_table(file_path)
+    hours = table.minutes('ToolWaiting') / 60
+    segments = table.values('Seg')
+    waiting_rows = hours > 0
+    hours, segments = hours[waiting_rows], segments[waiting_rows]
+    return {f"TOOL WAITING/{segment}": hours[segments == segment] for segment in dict.fromkeys(segments)}
+
+
+# Identifies what a fit depends on: the data, the candidate families with their fit arguments
+# (those of CANDIDATES unless fit_args, {family: arguments}, replaces them) and the bootstrap settings
+def dataset_hash(data, candidates, bootstrap=0, seed=None, fit_args=None):
+    fit_args = fit_args or {}
+    digest = hashlib.sha256(np.ascontiguousarray(data, dtype=float).tobytes())
+    digest.update(repr([(name, fit_args.get(name, CANDIDATES[name])) for name in candidates]).encode())
+    digest.update(repr((bootstrap, seed)).encode())
+    return digest.hexdigest()
+
+
+# Fit one family to one dataset, given as (key, family, data, bootstrap replicates, seed, fit
+# arguments); returns (key, family, params, statistics, bootstrap p-values or None)
+def fit_candidate(task):
+    from pfe.goodnessoffit import goodness_of_fit
+
+    key, family, data, bootstrap, seed, family_fit_args = task
+    params, statistics, p_values = goodness_of_fit(family, data, bootstrap, seed, family_fit_args)
+    return key, family, params, statistics, p_values
+
+
+# Fit every candidate family to every dataset ({key: data}), over `workers` processes
+# (None for one per CPU, 1 to stay in this process). With bootstrap > 0, every fit also gets
+# parametric bootstrap p-values from that many refitted samples, drawn from a stream spawned from
+# seed for each (dataset, family) so the results do not depend on the number of workers.
+# fit_args ({key: {family: fit arguments}}, e.g. FREE_LOC) replaces the fit arguments of CANDIDATES
+# for some datasets.
+# Returns {key: {family: {params, ks_stat, ad_stat, cvm_stat, p_values}}}.
+def fit_datasets(datasets, candidates=None, workers=None, bootstrap=0, seed=None, fit_args=None):
+    if candidates is None:
+        candidates = list(CANDIDATES)
+    fit_args = fit_args or {}
+    pairs = [(key, family) for key in datasets for family in candidates]
+    seeds = np.random.SeedSequence(seed).spawn(len(pairs))
+    tasks = [
+        (
+            key, family, np.asarray(datasets[key], dtype=float), bootstrap, task_seed,
+            fit_args.get(key, {}).get(family, CANDIDATES[family]),
+        )
+        for (key, family), task_seed in zip(pairs, seeds)
+    ]
+    if workers == 1 or len(tasks) <= 1:
+        results = [fit_candidate(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(fit_candidate, tasks))
+
+    fits = {key: {} for key in datasets}
+    for key, family, params, statistics, p_values in results:
+        fits[key][family] = {
+            "params": list(params),
+            "ks_stat": statistics["ks"],
+            "ad_stat": statistics["ad"],
+            "cvm_stat": statistics["cvm"],
+            "p_values": p_values,
+        }
+    return fits
+
+
+# Family with the smallest KS statistic among families (all fitted ones by default)
+def best_fit(fits, families=None):
+    if families is None:
+        families = list(fits)
+    return min((family for family in families if family in fits), key=lambda family: fits[family]["ks_stat"])
+
+
+def registry_path(path=None):
+    return path if path is not None else os.path.join(paramtables.DATA_DIR, REGISTRY_PATH)
+
+
+def load_registry(path=None):
+    path = registry_path(path)
+    if not os.path.exists(path):
+        return {"format": REGISTRY_FORMAT, "version": 0, "entries": {}}
+    with open(path) as file:
+        registry = json.load(file)
+    if registry.get("format") != REGISTRY_FORMAT:
+        raise ValueError(f"{path}: unsupported registry format {registry.get('format')}")
+    return registry
+
+
+def save_registry(registry, path=None):
+    with atomic_write(registry_path(path)) as file:
+        json.dump(registry, file, indent=2)
+
+
+# Refit the datasets ({key: data}, read from the files in sources, {key: file}) whose content changed
+# since the registry at path (the data folder's by default) was written, and save it with its version
+# bumped if anything changed.
+# Returns the registry and the keys that were refitted.
+def update_registry(datasets, sources, path=None, candidates=None, workers=None, bootstrap=0, seed=None):
+    if candidates is None:
+        candidates = list(CANDIDATES)
+    registry = load_registry(path)
+    entries = registry["entries"]
+    hashes = {key: dataset_hash(data, candidates, bootstrap, seed) for key, data in datasets.items()}
+    changed = {key: data for key, data in datasets.items() if entries.get(key, {}).get("hash") != hashes[key]}
+    if not changed:
+        return registry, []
+
+    for key, fits in fit_datasets(changed, candidates, workers, bootstrap, seed).items():
+        entries[key] = {
+            "source": sources.get(key),
+            "hash": hashes[key],
+            "n": len(changed[key]),
+            "best": best_fit(fits),
+            "fits": fits,
+        }
+    registry["version"] += 1
+    registry["updated"] = datetime.datetime.now().isoformat(timespec="seconds")
+    save_registry(registry, path)
+    return registry, list(changed)
+
+
+# (family, params) of every entry of the registry at path, in the `distributions` layout of the
+# simulators, the best among the families they can sample. Entries missing from the registry (or
+# a missing registry) keep their value in `default`.
+def load_distributions(default, path=None):
+    entries = load_registry(path)["entries"]
+    distributions = dict(default)
+    for name in default:
+        if name in entries:
+            fits = entries[name]["fits"]
+            family = best_fit(fits, SIMULATED_FAMILIES)
+            distributions[name] = (family, tuple(fits[family]["params"]))
+    return distributions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the duration distributions and update the parameter registry")
+    parser.add_argument("--registry", default=None, help=f"default: {REGISTRY_PATH} in the data folder")
+    parser.add_argument("--time-loss", default="time_loss_data.csv")
+    parser.add_argument("--tool-waiting", default="ToolWaitingPerSegPerHour.csv")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--bootstrap", type=int, default=1000, help="bootstrap replicates of the p-values, 0 for none")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    datasets = {}
+    sources = {}
+    for source, source_datasets in [
+        (args.time_loss, time_loss_datasets(args.time_loss)),
+        (args.tool_waiting, tool_waiting_datasets(args.tool_waiting)),
+    ]:
+        datasets.update(source_datasets)
+        sources.update({key: source for key in source_datasets})
+    registry, refitted = update_registry(
+        datasets, sources, args.registry, workers=args.workers, bootstrap=args.bootstrap, seed=args.seed
+    )
+
+    print(f"Registry {registry_path(args.registry)}, version {registry['version']}: {len(refitted)} dataset(s) refitted")
+    for key, entry in registry["entries"].items():
+        fit = entry["fits"][entry["best"]]
+        params = ', '.join(f'{param:.2f}' for param in fit["params"])
+        line = f"{key}: best fit {entry['best']} ({params}), n={entry['n']}"
+        if fit.get("p_values"):
+            line += ", p-values " + ', '.join(f"{name} {p:.3f}" for name, p in fit["p_values"].items())
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import numpy as np
+from scipy.stats import norm, expon, lognorm, weibull_min, poisson
+
+from pfe.sampling import as_generator
+
+# Goodness of fit of the candidate families of fitting.py. The Kolmogorov-Smirnov, Anderson-Darling
+# and Cramer-von Mises statistics all come from one pass over the fitted CDF at the sorted data.
+# Their textbook p-values assume known parameters; with parameters fitted to the same data they are
+# far too optimistic, so p-values come from a parametric bootstrap instead: samples are drawn from
+# the fitted distribution, refitted, and their statistics compared with the observed ones. Every
+# fit is written in closed form or as a few Newton steps over a whole (replicates, n) array, so
+# thousands of refits take one vectorized pass.
+
+FAMILIES = {
+    "norm": norm,
+    "expon": expon,
+    "lognorm": lognorm,
+    "weibull_min": weibull_min,
+    "poisson": poisson,
+}
+
+STATISTICS = ["ks", "ad", "cvm"]
+
+# Keeps the CDF away from 0 and 1 in the Anderson-Darling logarithms
+EPS = 1e-12
+
+# Replicates refitted together, bounds the size of the arrays of the bootstrap
+CHUNK_SIZE = 256
+
+
+# Shape of the Weibull distribution (loc fixed at 0) maximizing the likelihood of each row of x,
+# by Newton's method on the profile likelihood equation, started from the lognormal moments
+def weibull_shape(x, iterations=50, tol=1e-10):
+    log_x = np.log(x)
+    mean_log = log_x.mean(axis=-1, keepdims=True)
+    c = 1.2 / np.maximum(log_x.std(axis=-1, keepdims=True), 1e-6)
+    for _ in range(iterations):
+        # Powers relative to the largest value of the row, the ratios below do not change
+        x_c = np.exp(c * (log_x - log_x.max(axis=-1, keepdims=True)))
+        s0 = x_c.sum(axis=-1, keepdims=True)
+        s1 = (x_c * log_x).sum(axis=-1, keepdims=True)
+        s2 = (x_c * log_x ** 2).sum(axis=-1, keepdims=True)
+        g = s1 / s0 - 1 / c - mean_log
+        dg = s2 / s0 - (s1 / s0) ** 2 + 1 / c ** 2
+        step = g / dg
+        c = np.maximum(c - step, c / 2)
+        if np.all(np.abs(step) < tol * c):
+            break
+    return c
+
+
+# Maximum likelihood parameters of family for each row of x (a (replicates, n) array, or one
+# sample), with the same conventions as fitting.CANDIDATES: loc fixed at 0 for lognorm and
+# weibull_min, the mean for poisson. fit_args, the scipy.stats fit arguments, can set other
+# conventions for lognorm and weibull_min ({} leaves loc free); those are fitted numerically,
+# one row at a time. Returns a tuple of (replicates, 1) arrays.
+def fit_params(family, x, fit_args=None):
+    x = np.atleast_2d(np.asarray(x, dtype=float))
+    if family in ("lognorm", "weibull_min") and fit_args is not None and fit_args != {"floc": 0}:
+        params = np.array([FAMILIES[family].fit(row, **fit_args) for row in x])
+        return tuple(params[:, k:k + 1] for k in range(params.shape[1]))
+    if family == "norm":
+        return x.mean(axis=-1, keepdims=True), x.std(axis=-1, keepdims=True)
+    elif family == "expon":
+        loc = x.min(axis=-1, keepdims=True)
+        return loc, x.mean(axis=-1, keepdims=True) - loc
+    elif family == "lognorm":
+        log_x = np.log(x)
+        zeros = np.zeros((len(x), 1))
+        return log_x.std(axis=-1, keepdims=True), zeros, np.exp(log_x.mean(axis=-1, keepdims=True))
+    elif family == "weibull_min":
+        c = weibull_shape(x)
+        # scale = mean(x^c)^(1/c), with the powers taken relative to the largest value
+        log_max = np.log(x).max(axis=-1, keepdims=True)
+        mean_power = np.mean(np.exp(c * (np.log(x) - log_max)), axis=-1, keepdims=True)
+        return c, np.zeros((len(x), 1)), np.exp(log_max + np.log(mean_power) / c)
+    elif family == "poisson":
+        return (x.mean(axis=-1, keepdims=True),)
+    else:
+        raise ValueError(f"Unknown distribution: {family}")
+
+
+# KS, AD and CvM statistics of each row of x against family with the given parameters
+# (as returned by fit_params), from the CDF at the sorted values
+def gof_statistics(family, x, params):
+    x = np.sort(np.atleast_2d(np.asarray(x, dtype=float)), axis=-1)
+    n = x.shape[-1]
+    u = FAMILIES[family].cdf(x, *params)
+    i = np.arange(1, n + 1)
+
+    ks = np.maximum((i / n - u).max(axis=-1), (u - (i - 1) / n).max(axis=-1))
+    cvm = 1 / (12 * n) + ((u - (2 * i - 1) / (2 * n)) ** 2).sum(axis=-1)
+    u = np.clip(u, EPS, 1 - EPS)
+    ad = -n - ((2 * i - 1) * (np.log(u) + np.log1p(-u[..., ::-1]))).sum(axis=-1) / n
+    return {"ks": ks, "ad": ad, "cvm": cvm}
+
+
+# Bootstrap statistics of `replicates` samples of size n drawn from family with params, each one
+# refitted (with fit_args, see fit_params) before it is scored
+def bootstrap_statistics(family, params, n, replicates, rng, fit_args=None):
+    results = {name: [] for name in STATISTICS}
+    for start in range(0, replicates, CHUNK_SIZE):
+        size = min(CHUNK_SIZE, replicates - start)
+        samples = FAMILIES[family].rvs(*params, size=(size, n), random_state=rng).astype(float)
+        if family in ("lognorm", "weibull_min"):
+            samples = np.maximum(samples, np.finfo(float).tiny)
+        statistics = gof_statistics(family, samples, fit_params(family, samples, fit_args))
+        for name in STATISTICS:
+            results[name].append(statistics[name])
+    return {name: np.concatenate(values) for name, values in results.items()}
+
+
+# Fit family to data (with fit_args, see fit_params) and score the fit. With replicates > 0, adds
+# parametric bootstrap p-values (the share of refitted bootstrap samples fitting at least as badly
+# as the data). Returns the parameters, the statistics and the p-values.
+def goodness_of_fit(family, data, replicates=0, rng=None, fit_args=None):
+    data = np.asarray(data, dtype=float)
+    params = fit_params(family, data, fit_args)
+    observed = {name: float(value[0]) for name, value in gof_statistics(family, data, params).items()}
+    p_values = None
+    if replicates > 0:
+        rng = as_generator(rng)
+        flat_params = tuple(float(param[0, 0]) for param in params)
+        bootstrap = bootstrap_statistics(family, flat_params, len(data), replicates, rng, fit_args)
+        p_values = {
+            name: float((1 + np.sum(bootstrap[name] >= observed[name])) / (replicates + 1))
+            for name in STATISTICS
+        }
+    return tuple(float(param[0, 0]) for param in params), observed, p_values
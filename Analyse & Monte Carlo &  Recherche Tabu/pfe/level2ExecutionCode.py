@@ -0,0 +1,507 @@
+import csv
+import copy
+import math
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from collections import Counter
+from datetime import datetime, timedelta
+
+from pfe.level2Montefuction import MontecarloSim as monte_carlo_simulation
+from pfe.level2Montefuction import simulation_config, distributions
+from pfe.samplebank import SampleBank
+from pfe.sampling import as_generator
+from pfe.schedule import Schedule, truck_table
+from pfe.simcache import SimulationCache
+from pfe.searchtelemetry import SearchTelemetry
+from pfe.surrogate import SurfaceTable
+from pfe.tabumemory import TabuMemory
+
+# Every call draws fresh random numbers; part of the cache key so results simulated
+# under a different random number policy are never mixed up
+RNG_POLICY = "fresh"
+
+simulation_cache = SimulationCache()
+
+# Common random numbers shared by all evaluations of a search, None for fresh draws
+sample_bank = None
+
+# Root seed of the simulations' random streams (see simulation_rng), None for unseeded fresh draws
+simulation_seed = None
+
+# Response surface answering simulation queries from a precomputed table, None to simulate live
+surrogate_table = None
+
+# Simulation lookups of this process: "simulation_calls" made, "simulation_runs" of MontecarloSim
+# they needed (the others came from the cache) and "surrogate_lookups"
+simulation_counts = Counter()
+
+# Neighborhoods of fewer moves are scored in this process even when there is a pool of workers
+MIN_PARALLEL_NEIGHBORHOOD = 4
+
+# Simulations run while evaluating one candidate (see evaluate_candidate), by cache key;
+# None outside of an evaluation
+computed_simulations = None
+
+
+def minutes_to_hhmm(minutes):
+    base_time = datetime(1900, 1, 1, 0, 0)  
+    time_delta = timedelta(minutes=minutes)
+    return base_time + time_delta
+
+def read_csv(file_path):
+    trucks = []
+    with open(file_path, 'r') as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            trucks.append({
+                'truck_id': row['truck_id'],
+                'BL': row['BL'],
+            })
+    return trucks
+
+# Monte Carlo estimate for one truck of segment bl arriving in the slot starting at slot_start,
+# served from the cache when the same slot, truck count and segment were already simulated
+def cached_simulation(slot_start, num_trucks, bl):
+    simulation_counts["simulation_calls"] += 1
+    if surrogate_table is not None:
+        simulation_counts["surrogate_lookups"] += 1
+        return surrogate_table.lookup(minutes_to_hhmm(slot_start), num_trucks, bl)
+    if sample_bank is not None:
+        rng_policy, uniforms = sample_bank.policy(), sample_bank.uniforms
+    elif simulation_seed is not None:
+        rng_policy, uniforms = ("seeded", simulation_seed), None
+    else:
+        rng_policy, uniforms = RNG_POLICY, None
+    key = (slot_start, num_trucks, bl, simulation_config(), rng_policy)
+
+    def simulate():
+        simulation_counts["simulation_runs"] += 1
+        rng = simulation_rng(slot_start, num_trucks, bl) if simulation_seed is not None else None
+        result = monte_carlo_simulation(minutes_to_hhmm(slot_start), num_trucks, bl, uniforms, rng)
+        if computed_simulations is not None:
+            computed_simulations[key] = result
+        return result
+    return simulation_cache.get_or_compute(key, simulate)
+
+# Random stream of one simulation, spawned from simulation_seed and the simulation's inputs:
+# whichever process runs it and whenever it runs, a simulation gets the same draws, so a
+# parallel search gives the same results as a serial one and cached results stay consistent
+def simulation_rng(slot_start, num_trucks, bl):
+    spawn_key = (int(slot_start), int(num_trucks), zlib.crc32(bl.encode()))
+    return np.random.default_rng(np.random.SeedSequence(simulation_seed, spawn_key=spawn_key))
+
+# Draw the fresh random numbers of every simulation from streams spawned from seed,
+# seed=None goes back to unseeded draws
+def use_simulation_seed(seed):
+    global simulation_seed
+    simulation_seed = seed
+
+# Simulation lookups made since `before`, a copy of simulation_counts
+def simulation_counts_since(before):
+    counts = simulation_counts.copy()
+    counts.subtract(before)
+    return +counts
+
+# Evaluate every schedule from now on against the same bank of n_samples scenarios.
+# n_samples=None goes back to fresh draws on every simulation.
+def use_common_random_numbers(n_samples, seed=None):
+    global sample_bank
+    if n_samples is None:
+        sample_bank = None
+    else:
+        sample_bank = SampleBank(n_samples, len(distributions), seed)
+    return sample_bank
+
+# Answer every simulation query from the response surface table at path (see surrogate.py),
+# path=None goes back to live simulation
+def use_surrogate(path):
+    global surrogate_table
+    surrogate_table = SurfaceTable(path) if path is not None else None
+    return surrogate_table
+
+def convert_to_minutes(time_str):
+    # Assumes time_str is in format 'HH:MM'
+    hours, minutes = map(int, time_str.split(':'))
+    return hours * 60 + minutes
+
+def create_time_segments():
+    # Time segments between 8 AM and 4:30 PM, each 30 mins
+    segments = []
+    start_time = 8 * 60  # 8:00 AM in minutes
+    end_time = 16 * 60 + 30  # 4:30 PM in minutes
+    while start_time < end_time:
+        segments.append((start_time, start_time + 30))
+        start_time += 30
+    return segments
+
+# rng: np.random.Generator (or seed) of the random slots
+def solution_zero(trucks, rng=None):
+    rng = as_generator(rng)
+    time_segments = create_time_segments()
+    S0_slots = rng.integers(len(time_segments), size=len(trucks))
+    return Schedule(truck_table(trucks), S0_slots)
+
+# schedule is a Schedule, or a DataFrame in the original truck_id/BL/"Time Segment" layout
+def objective_function(schedule):
+    time_segments = create_time_segments()
+    if not isinstance(schedule, Schedule):
+        schedule = Schedule.from_dataframe(schedule, time_segments)
+    trucks_per_time_segment = schedule.counts(len(time_segments)).tolist()
+    
+    simulation_time = 0
+    last_nonempty_time = 0  # Initialize the last_nonempty_time
+    
+    for i, time_segment in enumerate(time_segments):
+        num_trucks = trucks_per_time_segment[i]
+        
+        for truck in np.flatnonzero(schedule.slots == i):
+            bl = schedule.trucks.bls[truck]
+            processing_time, std_dev = cached_simulation(time_segment[0], num_trucks, bl)
+            simulation_time += processing_time
+            for j in range(i + 1, len(time_segments)):
+                if time_segments[j][0] <= (time_segment[0] + processing_time):
+                    trucks_per_time_segment[j] += 1
+            last_nonempty_time = time_segment
+    
+    return simulation_time, last_nonempty_time
+
+# Same objective as objective_function, kept per time segment: the trucks of each segment (per BL),
+# the trucks carried over into it from earlier segments, its simulated time and the carry-over it
+# sends downstream. Moving one truck then only re-simulates the segments whose occupancy changes.
+class IncrementalObjective:
+
+    def __init__(self, schedule):
+        self.time_segments = create_time_segments()
+        n = len(self.time_segments)
+        self.trucks = [Counter() for _ in range(n)]
+        for slot, bl in zip(schedule.slots.tolist(), schedule.trucks.bls):
+            self.trucks[slot][bl] += 1
+        self.num_trucks = [None] * n
+        self.simulation_time = [0.0] * n
+        self.carry_over = [Counter() for _ in range(n)]
+        self.update(range(n))
+
+    def copy(self):
+        other = copy.copy(self)
+        other.trucks = [Counter(trucks) for trucks in self.trucks]
+        other.num_trucks = list(self.num_trucks)
+        other.simulation_time = list(self.simulation_time)
+        other.carry_over = list(self.carry_over)
+        # The lookups of the evaluation that produced self are not the copy's
+        other.simulation_counts = Counter()
+        other.computed_simulations = {}
+        return other
+
+    # Simulate segment i with num_trucks trucks at the base
+    def simulate_segment(self, i, num_trucks):
+        start = self.time_segments[i][0]
+        simulation_time = 0
+        carry_over = Counter()
+        for bl, count in self.trucks[i].items():
+            processing_time, std_dev = cached_simulation(start, num_trucks, bl)
+            simulation_time += count * processing_time
+            for j in range(i + 1, len(self.time_segments)):
+                if self.time_segments[j][0] <= start + processing_time:
+                    carry_over[j] += count
+        self.num_trucks[i] = num_trucks
+        self.simulation_time[i] = simulation_time
+        self.carry_over[i] = carry_over
+
+    # Re-simulate the changed segments, then every later segment whose number of trucks
+    # changed through the carry-over; the others keep their stored contribution
+    def update(self, changed):
+        changed = set(changed)
+        first = min(changed)
+        carried = Counter()
+        for i in range(first):
+            carried.update(self.carry_over[i])
+        for i in range(first, len(self.time_segments)):
+            num_trucks = sum(self.trucks[i].values()) + carried[i]
+            if i in changed or num_trucks != self.num_trucks[i]:
+                self.simulate_segment(i, num_trucks)
+            carried.update(self.carry_over[i])
+
+    # Move one truck of segment bl from time segment index i to j
+    def move(self, bl, i, j):
+        if i == j:
+            return
+        self.trucks[i][bl] -= 1
+        if self.trucks[i][bl] == 0:
+            del self.trucks[i][bl]
+        self.trucks[j][bl] += 1
+        self.update([i, j])
+
+    def value(self):
+        last_nonempty_time = 0
+        for i, trucks in enumerate(self.trucks):
+            if trucks:
+                last_nonempty_time = self.time_segments[i]
+        return sum(self.simulation_time), last_nonempty_time
+
+# A random move: the index of one truck and the index of its new time segment
+def random_move(schedule, rng=None):
+    rng = as_generator(rng)
+    times = create_time_segments()
+    random_index = int(rng.integers(len(schedule)))
+    new_slot = int(rng.integers(len(times)))
+    return random_index, new_slot
+
+def apply_move(schedule, move):
+    random_index, new_slot = move
+    return schedule.with_move(random_index, new_slot)
+
+def generate_neighbor(schedule, rng=None):
+    return apply_move(schedule, random_move(schedule, rng))
+
+# Objective of schedule after move, computed from the current schedule's IncrementalObjective.
+# Returns the neighbor's IncrementalObjective, current_objective is left untouched.
+def evaluate_move(schedule, current_objective, move):
+    random_index, new_slot = move
+    neighbor_objective = current_objective.copy()
+    neighbor_objective.move(schedule.trucks.bls[random_index], int(schedule.slots[random_index]), new_slot)
+    return neighbor_objective
+
+# Worker side of the parallel neighborhood evaluation: every worker rebuilds the same sample bank,
+# spawns its simulation streams from the same seed as the main process and starts from a copy of
+# its simulation cache (cache_entries)
+def init_worker(crn_samples, crn_seed, surrogate=None, simulation_seed=None, cache_entries=None):
+    use_common_random_numbers(crn_samples, crn_seed)
+    use_surrogate(surrogate)
+    use_simulation_seed(simulation_seed)
+    if cache_entries is not None:
+        simulation_cache.merge(cache_entries)
+
+# Objective of current_objective after moving one truck of BL bl from old_slot to new_slot.
+# The simulation lookups it took and the simulations it ran are attached to it, so they are
+# counted and cached wherever it ran.
+def evaluate_candidate(current_objective, bl, old_slot, new_slot):
+    global computed_simulations
+    before = simulation_counts.copy()
+    computed_simulations = {}
+    try:
+        neighbor_objective = current_objective.copy()
+        neighbor_objective.move(bl, old_slot, new_slot)
+        neighbor_objective.simulation_counts = simulation_counts_since(before)
+        neighbor_objective.computed_simulations = computed_simulations
+    finally:
+        computed_simulations = None
+    return neighbor_objective
+
+# Objectives of a batch of candidates, given as (current objective, [(BL, old slot, new slot), ...]),
+# so that the current objective is sent to a worker once per batch rather than once per candidate
+def evaluate_candidates(batch):
+    current_objective, candidates = batch
+    return [evaluate_candidate(current_objective, *candidate) for candidate in candidates]
+
+# Add the simulations a worker ran for neighbor_objective, and its cache lookups, to this process's cache
+def merge_worker_simulations(neighbor_objective):
+    counts = neighbor_objective.simulation_counts
+    misses = counts["simulation_runs"]
+    hits = counts["simulation_calls"] - counts["surrogate_lookups"] - misses
+    simulation_cache.merge(neighbor_objective.computed_simulations, hits, misses)
+
+# Objectives of all moves from schedule, in the order of moves. With a pool of workers, the moves
+# are split into one batch per worker and the simulations the workers ran are added to this
+# process's cache; small neighborhoods are scored here.
+def evaluate_neighborhood(schedule, current_objective, moves, pool=None, workers=1):
+    candidates = [(schedule.trucks.bls[index], int(schedule.slots[index]), new_slot) for index, new_slot in moves]
+    if pool is None or workers <= 1 or len(candidates) < MIN_PARALLEL_NEIGHBORHOOD:
+        return evaluate_candidates((current_objective, candidates))
+    batch_size = math.ceil(len(candidates) / workers)
+    batches = [(current_objective, candidates[i:i + batch_size]) for i in range(0, len(candidates), batch_size)]
+    neighbor_objectives = [objective for batch in pool.map(evaluate_candidates, batches) for objective in batch]
+    for neighbor_objective in neighbor_objectives:
+        merge_worker_simulations(neighbor_objective)
+    return neighbor_objectives
+
+# crn_samples: if set, all evaluations of this search share one bank of that many
+# common random numbers, so neighbors are ranked on identical scenarios
+# neighborhood_size: number of random moves scored per iteration, the best allowed one is taken
+# workers: number of processes scoring the neighborhood, None to score it in this process
+# trace: optional list, receives (iteration, current time, best time) after every iteration
+# surrogate: path of a response surface table (surrogate.py) answering objective queries
+# instead of live simulation
+# telemetry: optional SearchTelemetry, receives the per-iteration counters and phase timings
+# seed: root seed of the search. The initial solution and the moves, the simulations' fresh draws
+# and (unless crn_seed is given) the common random numbers each get a stream spawned from it, so
+# the same seed gives bit-identical results with or without workers. None for unseeded draws.
+def tabu_search(trucks, max_iterations, tabu_tenure, crn_samples=None, crn_seed=None, neighborhood_size=1, workers=None, trace=None, surrogate=None, telemetry=None, seed=None):
+    if seed is None:
+        rng, search_simulation_seed = as_generator(None), None
+    else:
+        search_stream, simulation_stream, crn_stream = np.random.SeedSequence(seed).spawn(3)
+        rng = np.random.default_rng(search_stream)
+        search_simulation_seed = int(simulation_stream.generate_state(1, np.uint64)[0])
+        if crn_seed is None:
+            crn_seed = int(crn_stream.generate_state(1, np.uint64)[0])
+    # The search's settings only hold while it runs, later simulations get the previous ones back
+    settings = sample_bank, surrogate_table, simulation_seed
+    pool = None
+    try:
+        bank = use_common_random_numbers(crn_samples, crn_seed)
+        use_surrogate(surrogate)
+        use_simulation_seed(search_simulation_seed)
+        
+        if workers is not None and workers > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=init_worker,
+                initargs=(
+                    crn_samples, bank.seed if bank is not None else None, surrogate, search_simulation_seed,
+                    dict(simulation_cache.entries),
+                ),
+            )
+        return run_tabu_search(trucks, max_iterations, tabu_tenure, neighborhood_size, pool, trace, telemetry, rng, workers)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        restore_simulation_settings(settings)
+
+# Put back the (sample bank, surrogate table, simulation seed) saved before a search
+def restore_simulation_settings(settings):
+    global sample_bank, surrogate_table, simulation_seed
+    sample_bank, surrogate_table, simulation_seed = settings
+
+def run_tabu_search(trucks, max_iterations, tabu_tenure, neighborhood_size, pool, trace=None, telemetry=None, rng=None, workers=1):
+    if telemetry is None:
+        telemetry = SearchTelemetry()
+    
+    # Initial solution
+    before = simulation_counts.copy()
+    best_solution = solution_zero(trucks, rng)
+    current_objective = IncrementalObjective(best_solution)
+    best_time, best_max_time = current_objective.value()
+    telemetry.count({"objective_evaluations": 1})
+    telemetry.count(simulation_counts_since(before))
+    
+    # Tabu memory: (truck, slot it just left) pairs, tabu for tabu_tenure iterations
+    tabu_memory = TabuMemory(tabu_tenure)
+    
+    current_solution = best_solution.copy()
+    current_time, current_max_time = best_time, best_max_time
+    
+    for iteration in range(max_iterations):
+        accepted = tabu_iteration(
+            current_solution, current_objective, tabu_memory, iteration, best_time, neighborhood_size, pool, telemetry, rng,
+            workers,
+        )
+        if accepted is not None:
+            move, neighbor_objective = accepted
+            truck, new_slot = move
+            tabu_memory.add(truck, int(current_solution.slots[truck]), iteration)
+            current_solution = apply_move(current_solution, move)
+            current_objective = neighbor_objective
+            current_time, current_max_time = current_objective.value()
+            if current_time < best_time:
+                best_solution = current_solution.copy()
+                best_time = current_time
+                best_max_time = current_max_time
+            elif current_time == best_time:
+                if current_max_time < best_max_time:
+                    best_solution = current_solution.copy()
+                    best_time = current_time
+                    best_max_time = current_max_time
+        if trace is not None:
+            trace.append((iteration, current_time, best_time))
+        telemetry.end_iteration(
+            iteration, current_time, best_time, best_max_time,
+            accepted=accepted is not None, tabu_size=len(tabu_memory),
+        )
+    
+    return best_solution.to_dataframe(create_time_segments()), best_time, best_max_time
+
+# One iteration of the search from current_solution: score neighborhood_size random moves and pick
+# the best one the tabu memory allows. Returns (move, its IncrementalObjective), None if all are tabu.
+def tabu_iteration(current_solution, current_objective, tabu_memory, iteration, best_time, neighborhood_size=1, pool=None, telemetry=None, rng=None, workers=1):
+    if telemetry is None:
+        telemetry = SearchTelemetry()
+    with telemetry.phase("generate_neighbors"):
+        moves = [random_move(current_solution, rng) for _ in range(neighborhood_size)]
+    # Each neighbor is evaluated once, from the current solution's per-segment objective
+    with telemetry.phase("evaluate_neighbors"):
+        neighbor_objectives = evaluate_neighborhood(current_solution, current_objective, moves, pool, workers)
+    telemetry.count({"objective_evaluations": len(neighbor_objectives)})
+    for neighbor_objective in neighbor_objectives:
+        telemetry.count(neighbor_objective.simulation_counts)
+    
+    with telemetry.phase("tabu_check"):
+        return select_move(moves, neighbor_objectives, tabu_memory, iteration, best_time)
+
+# Best move of the neighborhood allowed by the tabu memory, with its objective; None if all are tabu
+def select_move(moves, neighbor_objectives, tabu_memory, iteration, best_time):
+    neighborhood = sorted(zip(moves, neighbor_objectives), key=lambda x: x[1].value()[0])
+    tabu_memory.expire(iteration)
+    for move, neighbor_objective in neighborhood:
+        truck, new_slot = move
+        if tabu_memory.is_allowed(truck, new_slot, iteration, neighbor_objective.value()[0], best_time):
+            return move, neighbor_objective
+    return None
+
+# One search of multi_start_tabu_search, run in its own process with its own seed
+def single_start(run):
+    seed, trucks, max_iterations, tabu_tenure, crn_samples, crn_seed, neighborhood_size, surrogate = run
+    trace = []
+    telemetry = SearchTelemetry()
+    best_schedule, best_time, best_max_time = tabu_search(
+        trucks, max_iterations, tabu_tenure, crn_samples, crn_seed, neighborhood_size,
+        trace=trace, surrogate=surrogate, telemetry=telemetry, seed=seed,
+    )
+    return {
+        "seed": seed,
+        "best_schedule": best_schedule,
+        "best_time": best_time,
+        "best_max_time": best_max_time,
+        "trace": trace,
+        "telemetry": telemetry.summary(simulation_cache),
+    }
+
+# Run `starts` independent tabu searches, one per process, from distinct seeds spawned from seed.
+# All of them share the same common random numbers (if crn_samples is set) so their results compare.
+# Returns the overall best schedule, its times, and every run's result with its convergence trace
+# and telemetry summary.
+def multi_start_tabu_search(trucks, max_iterations, tabu_tenure, starts, seed=None, crn_samples=None, crn_seed=None, neighborhood_size=1, workers=None, surrogate=None):
+    if crn_samples is not None and crn_seed is None:
+        crn_seed = np.random.SeedSequence().entropy
+    seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(starts)]
+    runs = [
+        (run_seed, trucks, max_iterations, tabu_tenure, crn_samples, crn_seed, neighborhood_size, surrogate)
+        for run_seed in seeds
+    ]
+    with ProcessPoolExecutor(max_workers=workers or starts) as pool:
+        results = list(pool.map(single_start, runs))
+    
+    best = min(results, key=lambda result: (result["best_time"], result["best_max_time"]))
+    return best["best_schedule"], best["best_time"], best["best_max_time"], results
+
+def main():
+    global simulation_cache
+    file_path = 'dailylist.csv'
+    trucks = read_csv(file_path)
+    time_segments = create_time_segments()
+    
+    max_iterations = 1000
+    tabu_tenure = 50
+    
+    # Keep simulated slots between runs
+    simulation_cache = SimulationCache(path="montecarlo_cache.pkl")
+    # Same common random numbers on every run, so the persisted slots (keyed on them) are reused
+    crn_seed = 12345
+    
+    # One JSON line per iteration, then the summary
+    telemetry = SearchTelemetry("tabu_trace.jsonl")
+    best_schedule, best_time, best_max_time = tabu_search(
+        trucks, max_iterations, tabu_tenure, crn_samples=2000, crn_seed=crn_seed, neighborhood_size=16, workers=os.cpu_count(),
+        telemetry=telemetry,
+    )
+    simulation_cache.save()
+    for name, value in telemetry.close(simulation_cache).items():
+        print(f"{name}: {value}")
+    print("Best Schedule:", best_schedule)
+    print("Best Loading/Offloading Time:", best_time)
+    print("Best max Time:", minutes_to_hhmm(best_max_time[0]))  # Convert minutes to HH:MM
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import numpy as np
+
+from pfe.fitting import load_distributions
+from pfe.paramtables import tool_waiting_params, tool_waiting_version
+from pfe.sampling import as_generator, draw_uniforms, estimate_with_errors
+
+# Define the distributions and their parameters: the fits of the parameter registry
+# (fitting.py), these values for any event the registry does not have
+distributions = load_distributions({
+    "Base maneuvering time": ("lognorm", (0.77, 0.00, 5.76)),
+    "load/unloading time": ("expon", (1.00, 10.91)),
+    "TOOL WAITING": ("weibull_min", (0.94, 0.00, 28.28)),
+    "LOAD SECUREMENT": ("lognorm", (0.71, 0.00, 9.73)),
+    "Crane waiting": ("weibull_min", (0.79, 0.00, 91.62)),
+    "LiftTruck wait time": ("lognorm", (0.94, 0.00, 14.81)),
+    "Administrative papers/authorisations": ("weibull_min", (1.51, 0.00, 20.89)),
+    "Service Planification Delays": ("lognorm", (1.03, 0.00, 18.83)),
+    "Coordination SEG - DRIVERS": ("lognorm", (0.56, 0.00, 33.21)),
+    "other delays": ("weibull_min", (1.82, 0.00, 26.23)),
+})
+
+# Scale of the base maneuvering time lognormal, based on number of trucks (a number or an array)
+def base_maneuvering_scale(num_trucks):
+    return np.select(
+        [num_trucks < 2, num_trucks < 4, num_trucks < 6],
+        [4.253023255813953, 5.927441860465116, 7.166511627906976],
+        8.606511627906976,
+    )
+
+# Function to sample base maneuvering time based on number of trucks
+def sample_base_maneuvering_time(num_trucks, rng=None):
+    shape, loc, scale = 0.77, 0.0, base_maneuvering_scale(num_trucks)
+        
+    # Convert shape and scale to mean and sigma for the normal distribution
+    mean = np.log(scale)
+    sigma = shape
+    return as_generator(rng).lognormal(mean, sigma) 
+
+def sample_tool_waiting_time(hour, segment, rng=None):
+    params = tool_waiting_params(hour, segment)
+    if params is not None:
+        mean_waiting, std_dev_waiting = params
+        return as_generator(rng).normal(mean_waiting, std_dev_waiting) 
+    else:
+        return 0
+
+# Hardcoded probabilities for each event
+probabilities = {
+    "Base maneuvering time": 1.00,
+    "load/unloading time": 1.00,
+    "TOOL WAITING": 0.22,
+    "LOAD SECUREMENT": 1.00,
+    "Crane waiting": 0.14,
+    "LiftTruck wait time": 0.24,
+    "Administrative papers/authorisations": 0.28,
+    "Service Planification Delays": 0.12,
+    "Coordination SEG - DRIVERS": 0.09,
+    "other delays": 0.09,
+}
+
+# Number of simulations
+n_simulations = 10000
+
+# How MontecarloSim fills its uniform matrix, one of sampling.SAMPLING_MODES
+sampling_mode = "plain"
+
+# Everything besides its arguments that determines what MontecarloSim estimates, used in cache keys
+def simulation_config():
+    return (
+        n_simulations,
+        sampling_mode,
+        tuple((name, dist_name, params) for name, (dist_name, params) in distributions.items()),
+        tuple(probabilities.items()),
+        tool_waiting_version(),
+    )
+
+# Function to get random samples from a distribution
+def get_samples(dist_name, params, size, rng=None):
+    from scipy.stats import lognorm, expon, weibull_min
+
+    rng = as_generator(rng)
+    if dist_name == "lognorm":
+        s, loc, scale = params
+        return lognorm.rvs(s, loc, scale, size=size, random_state=rng)
+    elif dist_name == "expon":
+        loc, scale = params
+        return expon.rvs(loc, scale, size=size, random_state=rng)
+    elif dist_name == "weibull_min":
+        c, loc, scale = params
+        return weibull_min.rvs(c, loc, scale, size=size, random_state=rng)
+    else:
+        raise ValueError("Unknown distribution")
+
+# Calculate travel time
+def calculate_travel_time(distance_km, speed_kph=80, pause_interval=2, pause_duration=15):
+    travel_time_hours = distance_km / speed_kph
+    num_pauses = int(travel_time_hours // pause_interval)
+    total_pause_time = num_pauses * (pause_duration / 60)
+    total_travel_time_hours = travel_time_hours + total_pause_time
+    return total_travel_time_hours
+
+# Inverse CDF of each distribution, written with NumPy so that a whole column
+# of uniforms is turned into samples in one call
+def get_quantiles(dist_name, params, q):
+    from scipy.special import ndtri
+
+    if dist_name == "lognorm":
+        s, loc, scale = params
+        return loc + scale * np.exp(s * ndtri(q))
+    elif dist_name == "expon":
+        loc, scale = params
+        return loc - scale * np.log1p(-q)
+    elif dist_name == "weibull_min":
+        c, loc, scale = params
+        return loc + scale * (-np.log1p(-q)) ** (1 / c)
+    else:
+        raise ValueError("Unknown distribution")
+
+# Keeps the rescaled uniforms away from 0 and 1 where the inverse CDFs are infinite
+EPS = 1e-12
+
+# Total time at the base (minutes) for each row of u, an (n, number of events) array of uniforms.
+# num_trucks_at_base is a single count or one count per row.
+# Column j decides both whether event j happens (u < prob) and, rescaled to u / prob,
+# its duration through the inverse CDF, so one matrix draw covers the whole simulation.
+def simulate_time_at_base(arrival_hour, num_trucks_at_base, segment, u):
+    from scipy.special import ndtri
+
+    total_time_at_base = np.zeros(len(u))
+
+    for j, (name, (dist_name, params)) in enumerate(distributions.items()):
+        prob = probabilities[name]
+        occurs = u[:, j] < prob
+        q = np.clip(u[:, j] / prob, EPS, 1 - EPS)
+        if name == "Base maneuvering time":
+            durations = get_quantiles("lognorm", (0.77, 0.0, base_maneuvering_scale(num_trucks_at_base)), q)
+        elif name == "TOOL WAITING":
+            tool_params = tool_waiting_params(arrival_hour, segment)
+            if tool_params is None:
+                continue
+            mean_waiting, std_dev_waiting = tool_params
+            durations = mean_waiting + std_dev_waiting * ndtri(q)
+        else:
+            durations = get_quantiles(dist_name, params, q)
+        total_time_at_base += np.where(occurs, durations, 0.0)
+
+    return total_time_at_base
+
+
+# uniforms: optional (n, events) array, e.g. a SampleBank's, used instead of fresh draws
+# rng: np.random.Generator (or seed) the fresh draws come from
+def MontecarloSim(arrival_time_at_base,num_trucks_at_base, segment, uniforms=None, rng=None):
+    
+    
+
+    arrival_hour = arrival_time_at_base.hour
+
+    # Simulate the process: one (n_simulations x events) draw for all simulations
+    if uniforms is None:
+        u = draw_uniforms(sampling_mode, n_simulations, len(distributions), rng)
+    else:
+        u = uniforms
+    time_at_base = simulate_time_at_base(arrival_hour, num_trucks_at_base, segment, u)
+
+    simulation_results = time_at_base / 60  # Convert to hours
+
+    average = np.percentile(simulation_results, 50)
+    standard_dev = np.std(simulation_results)
+
+    return average, standard_dev
+
+
+# Median and standard deviation of the time at the base (hours) together with their standard
+# errors, from n_samples drawn with the given sampling mode over independent replicates
+def MontecarloSimReport(arrival_time_at_base, num_trucks_at_base, segment, n_samples=1024, sampling="sobol", replicates=8, rng=None):
+    arrival_hour = arrival_time_at_base.hour
+
+    def simulate(u):
+        return simulate_time_at_base(arrival_hour, num_trucks_at_base, segment, u) / 60
+
+    simulation_results, estimates, errors = estimate_with_errors(
+        simulate, sampling, n_samples, len(distributions), replicates, rng=rng
+    )
+    return {
+        "sampling": sampling,
+        "n_samples": len(simulation_results),
+        "median": estimates["median"],
+        "median_se": errors["median"],
+        "std": estimates["std"],
+        "std_se": errors["std"],
+    }
@@ -0,0 +1,103 @@
+import math
+
+import numpy as np
+
+from pfe.sampling import as_generator
+
+# Parameters
+num_kilometers = 100  # Example distance from X to Y
+av_trip = 2.0  # Average time to pass 1 km (minutes)
+min_trip = 1.0  # Minimum time to pass 1 km (minutes)
+sdev_trip = 0.5  # Standard deviation of time to pass 1 km (minutes)
+pause_interval = 2  # Hours of driving between two pauses
+pause_duration = 15  # Duration of a pause (minutes)
+num_simulations = 10000  # Number of Monte Carlo simulations
+seed = None  # Seed of the random draws, None for different draws on every run
+
+# Routes up to this many km are simulated km by km; longer ones are sums of so many independent
+# km times that a normal with their exact mean and variance describes them
+exact_km = 30
+
+# Mean and variance (minutes) of the time to pass one km: a normal of mean av_trip and standard
+# deviation sdev_trip, floored at min_trip
+def km_time_moments():
+    alpha = (min_trip - av_trip) / sdev_trip
+    density = math.exp(-alpha ** 2 / 2) / math.sqrt(2 * math.pi)
+    below = 0.5 * math.erfc(-alpha / math.sqrt(2))
+    mean = min_trip * below + av_trip * (1 - below) + sdev_trip * density
+    second_moment = (
+        min_trip ** 2 * below
+        + (av_trip ** 2 + sdev_trip ** 2) * (1 - below)
+        + sdev_trip * density * (av_trip + min_trip)
+    )
+    return mean, second_moment - mean ** 2
+
+# Driving times (minutes) with a pause of pause_duration after every pause_interval hours of driving
+def add_pauses(drive_minutes):
+    return drive_minutes + pause_duration * (drive_minutes // (pause_interval * 60))
+
+# Travel times (minutes) of every route of distances (km), as a (routes, n_simulations) array.
+# Routes of at most exact_km km add up their km times: one set of km times is drawn per simulation
+# and shared by these routes (each route gets the exact distribution, routes are not independent),
+# a fraction of km taking that fraction of the next km's time. Longer routes are drawn from the
+# normal with the exact moments of their sum.
+def simulate_routes(distances, n_simulations=None, rng=None):
+    if n_simulations is None:
+        n_simulations = num_simulations
+    rng = as_generator(rng)
+    distances = np.asarray(distances, dtype=float)
+    drive = np.empty((len(distances), n_simulations))
+
+    exact = distances <= exact_km
+    if exact.any():
+        km = int(np.ceil(distances[exact].max()))
+        km_times = np.maximum(rng.normal(av_trip, sdev_trip, (n_simulations, km)), min_trip)
+        cumulative = np.concatenate([np.zeros((n_simulations, 1)), np.cumsum(km_times, axis=1)], axis=1)
+        whole = np.floor(distances[exact]).astype(int)
+        fraction = distances[exact] - whole
+        upper = np.minimum(whole + 1, km)
+        drive[exact] = (cumulative[:, whole] * (1 - fraction) + cumulative[:, upper] * fraction).T
+
+    if not exact.all():
+        mean, variance = km_time_moments()
+        long_distances = distances[~exact][:, None]
+        normals = rng.standard_normal((len(long_distances), n_simulations))
+        drive[~exact] = long_distances * mean + np.sqrt(long_distances * variance) * normals
+
+    return add_pauses(drive)
+
+# Mean, standard deviation and 5th/50th/95th percentiles (minutes) of the travel time of every route
+def route_statistics(distances, n_simulations=None, rng=None):
+    travel_times = simulate_routes(distances, n_simulations, rng)
+    p5, p50, p95 = np.percentile(travel_times, [5, 50, 95], axis=1)
+    return {
+        "mean": travel_times.mean(axis=1),
+        "std": travel_times.std(axis=1),
+        "p5": p5,
+        "p50": p50,
+        "p95": p95,
+    }
+
+def main():
+    import matplotlib.pyplot as plt
+
+    # Monte Carlo simulation
+    total_times = simulate_routes([num_kilometers], rng=seed)[0]
+
+    # Results
+    mean_time = np.mean(total_times)
+    std_dev_time = np.std(total_times)
+
+    print(f"Estimated mean travel time: {mean_time:.2f} minutes")
+    print(f"Estimated standard deviation of travel time: {std_dev_time:.2f} minutes")
+
+    # Plotting the results
+    plt.hist(total_times, bins=50, edgecolor='black')
+    plt.title('Monte Carlo Simulation of Truck Travel Time')
+    plt.xlabel('Total Travel Time (minutes)')
+    plt.ylabel('Frequency')
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
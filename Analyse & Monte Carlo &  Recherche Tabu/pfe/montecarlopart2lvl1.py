@@ -0,0 +1,57 @@
+import numpy as np
+
+# Same events as MontecarloSim, with the distributions of the parameter registry
+from pfe.level2Montefuction import distributions, probabilities, get_quantiles, EPS
+from pfe.sampling import estimate_with_errors
+
+# Number of simulations and how their uniforms are drawn (one of sampling.SAMPLING_MODES);
+# Sobol points need far fewer samples than plain draws for the same precision
+n_simulations = 1024
+sampling = "sobol"
+
+# Seed of the random draws, None for different draws on every run
+seed = None
+
+# Total time (minutes) for each row of u: column j decides whether event j happens
+# and, rescaled, its duration through the inverse CDF
+def simulate(u):
+    total_times = np.zeros(len(u))
+    for j, (name, (dist_name, params)) in enumerate(distributions.items()):
+        prob = probabilities[name]
+        events_happen = u[:, j] < prob
+        samples = get_quantiles(dist_name, params, np.clip(u[:, j] / prob, EPS, 1 - EPS))
+        total_times += samples * events_happen
+    return total_times
+
+def main():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Simulate the total time for each simulation
+    total_times, estimates, errors = estimate_with_errors(
+        simulate, sampling, n_simulations, len(distributions), rng=np.random.default_rng(seed)
+    )
+
+    # Convert total times to hours, minutes, and seconds
+    total_times_seconds = total_times * 60  # convert minutes to seconds
+    total_times_hours = total_times_seconds // 3600
+    total_times_minutes = (total_times_seconds % 3600) // 60
+    total_times_seconds = total_times_seconds % 60
+
+    # Print some summary statistics
+    print(f"Mean total time: {estimates['mean']:.2f} minutes (standard error {errors['mean']:.2f})")
+    print(f"Median total time: {estimates['median']:.2f} minutes (standard error {errors['median']:.2f})")
+    print(f"Standard deviation of total time: {estimates['std']:.2f} minutes (standard error {errors['std']:.2f})")
+
+    # Plot the distribution of total times
+    plt.figure(figsize=(10, 6))
+    sns.histplot(total_times, bins=50, kde=True)
+    plt.title("Distribution of Total Times")
+    plt.xlabel("Total Time (Minutes)")
+    plt.ylabel("Frequency")
+    plt.grid(True)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+from pfe.truckcounts import TruckCountStore
+
+def main():
+    import matplotlib.pyplot as plt
+
+    # Load the CSV file
+    file_path = 'EnteryExit.csv'  # Replace with your CSV file path
+
+    # Trucks in the base for each hour of each day, kept between runs: only the days appended to the
+    # CSV since the last run are read (the store is rebuilt if the CSV was rewritten)
+    store = TruckCountStore('truck_count_store.pkl')
+    store.ingest(file_path)
+    store.save()
+
+    truck_count = store.truck_count()
+    unique_dates = list(truck_count.columns)
+
+    print("Trucks in base per hour of the day over", len(store), "days:")
+    print(store.summary())
+
+    # Plot the truck count for each day
+    n_rows = 3
+    n_cols = 3
+
+    def create_figure(dates_subset, figure_number):
+        # Create a figure with subplots
+        fig, axes = plt.subplots(n_rows, n_cols, figsize=(15, 12))
+        axes = axes.flatten()  # Flatten the 2D array of axes to iterate easily
+
+        # Plot the truck count for each day
+        for i, date in enumerate(dates_subset):
+            if i < len(axes):
+                ax = axes[i]
+                truck_count[date].plot(kind='line', ax=ax)
+                ax.set_title(f'Date: {date}', fontsize=8)
+                ax.set_xlabel('Hour of the Day', fontsize=6)
+                ax.set_ylabel('Number of Trucks in Base', fontsize=6)
+                ax.set_xticks(range(24))
+                ax.set_xticklabels(range(24), fontsize=6)
+                ax.set_yticklabels(ax.get_yticks(), fontsize=6)
+
+        # Adjust layout to prevent overlap
+        plt.tight_layout()
+        plt.suptitle(f'Figure {figure_number}: Number of Trucks in Base for Days {dates_subset[0]} to {dates_subset[-1]}', y=1.02)
+        plt.show()
+
+    # Create the first figure for the first 9 days
+    create_figure(unique_dates[:9], 1)
+
+    # Create the second figure for the next 9 days
+    create_figure(unique_dates[9:18], 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+
+from pfe.datastore import load_table
+
+# Segments as they appear in the exported CSVs, the row of each one in the tables below
+SEGMENTS = ["All", "DNM", "TST", "WL"]
+SEGMENT_CODES = {segment: code for code, segment in enumerate(SEGMENTS)}
+HOURS = 24
+
+# Folder of the exported CSVs: the working directory, like the scripts, unless PFE_DATA_DIR is set.
+# The column caches of datastore.py are written next to the files.
+DATA_DIR = os.environ.get("PFE_DATA_DIR", ".")
+TRUCK_COUNTS_FILE = "ExportedTimePerSegPreHour.csv"
+TOOL_WAITING_FILE = "ExportedToolWaitingPerSegPerHour.csv"
+
+# Parsed tables by file path, filled on first use so importing reads nothing
+tables = {}
+
+# Row of a segment in the tables, -1 if the segment is unknown
+def segment_code(segment):
+    return SEGMENT_CODES.get(segment, -1)
+
+# Parse an exported Hour,Segment,Average,Median,StdDev CSV into dense (segment, hour) arrays.
+# "present" marks the cells that had a row in the file, "sha256" is the hash of its content.
+def load_hourly_table(file_path):
+    data = load_table(file_path)
+    codes, labels = data.codes("Segment")
+    # Row of each label, and -1 for missing cells (code -1, the extra last entry)
+    label_rows = np.array([segment_code(label) for label in labels] + [-1])
+    segment_rows = label_rows[codes]
+    known = segment_rows >= 0
+    rows = segment_rows[known]
+    hours = data.values("Hour")[known].astype(int)
+
+    table = {}
+    for column in ["Average", "Median", "StdDev"]:
+        values = np.zeros((len(SEGMENTS), HOURS))
+        values[rows, hours] = data.values(column)[known].astype(float)
+        table[column] = values
+    present = np.zeros((len(SEGMENTS), HOURS), dtype=bool)
+    present[rows, hours] = True
+    table["present"] = present
+    table["sha256"] = data.source["sha256"]
+    return table
+
+# Table of one of the exports in DATA_DIR, parsed once
+def hourly_table(file_name):
+    file_path = os.path.join(DATA_DIR, file_name)
+    if file_path not in tables:
+        tables[file_path] = load_hourly_table(file_path)
+    return tables[file_path]
+
+# Average and standard deviation of the number of trucks at the base for an hour
+def truck_count_params(hour, segment="All"):
+    truck_counts = hourly_table(TRUCK_COUNTS_FILE)
+    code = SEGMENT_CODES[segment]
+    return truck_counts["Average"][code, hour], truck_counts["StdDev"][code, hour]
+
+# Hash of the tool waiting table's content, so results simulated from another version are told apart
+def tool_waiting_version():
+    return hourly_table(TOOL_WAITING_FILE)["sha256"]
+
+# Mean and standard deviation of the tool waiting time, None if the segment has no data for that hour
+def tool_waiting_params(hour, segment):
+    tool_waiting = hourly_table(TOOL_WAITING_FILE)
+    code = segment_code(segment)
+    if code < 0 or not tool_waiting["present"][code, hour]:
+        return None
+    return tool_waiting["Average"][code, hour], tool_waiting["StdDev"][code, hour]
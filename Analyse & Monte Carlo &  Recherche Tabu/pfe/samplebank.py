@@ -0,0 +1,22 @@
+import numpy as np
+
+
+# Pre-generated uniforms shared by every evaluation of a search (common random numbers).
+# MontecarloSim turns each row into one scenario, normal draws included (through the inverse
+# normal CDF), so two schedules evaluated on the same bank are compared on identical scenarios
+# and their difference carries far less noise than with independent draws.
+class SampleBank:
+
+    def __init__(self, n_simulations, n_events, seed=None):
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.seed = seed
+        self.uniforms = np.random.default_rng(seed).random((n_simulations, n_events))
+        self.uniforms.setflags(write=False)
+
+    def __len__(self):
+        return len(self.uniforms)
+
+    # Identifies the bank in cache keys: same seed and shape, same scenarios
+    def policy(self):
+        return ("crn", self.seed, self.uniforms.shape)
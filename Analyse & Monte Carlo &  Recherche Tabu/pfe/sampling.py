@@ -0,0 +1,65 @@
+import numpy as np
+
+# Ways of filling the (n, dim) uniform matrix that drives a simulation:
+#   plain       independent pseudo-random uniforms
+#   antithetic  each draw u is paired with 1 - u
+#   lhs         Latin hypercube, every column hits each of the n strata exactly once
+#   sobol       scrambled Sobol low-discrepancy points
+SAMPLING_MODES = ["plain", "antithetic", "lhs", "sobol"]
+
+
+# The np.random.Generator to draw from: rng itself if it is one, else one seeded by rng
+# (an int or a SeedSequence). rng=None seeds it from the global np.random state, so that
+# np.random.seed still makes runs without an explicit generator reproducible.
+def as_generator(rng=None):
+    if rng is None:
+        return np.random.default_rng(np.random.randint(2**63 - 1, dtype=np.int64))
+    return np.random.default_rng(rng)
+
+
+def draw_uniforms(mode, n, dim, rng=None):
+    rng = as_generator(rng)
+    if mode == "plain":
+        return rng.random((n, dim))
+    elif mode == "antithetic":
+        half = rng.random(((n + 1) // 2, dim))
+        return np.vstack([half, 1 - half])[:n]
+    elif mode == "lhs":
+        strata = np.argsort(rng.random((n, dim)), axis=0)
+        return (strata + rng.random((n, dim))) / n
+    elif mode == "sobol":
+        from scipy.stats import qmc
+
+        # Sobol points are balanced in blocks of 2^m, so n is rounded up to a power of two
+        sobol = qmc.Sobol(dim, scramble=True, seed=rng)
+        return sobol.random_base2(int(np.ceil(np.log2(max(n, 2)))))
+    else:
+        raise ValueError(f"Unknown sampling mode: {mode}")
+
+
+STATISTICS = {
+    "mean": np.mean,
+    "median": np.median,
+    "std": np.std,
+}
+
+# Run simulate(u) on `replicates` independent randomizations of n_samples uniforms in total.
+# Each statistic is estimated on the pooled results; its standard error comes from the spread
+# of the per-replicate estimates, which is valid for every sampling mode (plain MC formulas
+# would overstate the error of antithetic, LHS and Sobol samples).
+# Returns the pooled results, the estimates and their standard errors.
+def estimate_with_errors(simulate, mode, n_samples, dim, replicates=8, statistics=None, rng=None):
+    if statistics is None:
+        statistics = STATISTICS
+    rng = as_generator(rng)
+    per_replicate = max(n_samples // replicates, 2)
+    results = [np.asarray(simulate(draw_uniforms(mode, per_replicate, dim, rng))) for _ in range(replicates)]
+    pooled = np.concatenate(results)
+
+    estimates = {}
+    errors = {}
+    for name, statistic in statistics.items():
+        estimates[name] = statistic(pooled)
+        replicate_estimates = [statistic(result) for result in results]
+        errors[name] = np.std(replicate_estimates, ddof=1) / np.sqrt(replicates)
+    return pooled, estimates, errors
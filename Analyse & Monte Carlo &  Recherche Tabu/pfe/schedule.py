@@ -0,0 +1,58 @@
+from collections import namedtuple
+
+import numpy as np
+
+
+# The trucks of a day as two tuples, shared unchanged by every schedule built for that day
+TruckTable = namedtuple("TruckTable", ["truck_ids", "bls"])
+
+def truck_table(trucks):
+    return TruckTable(tuple(truck["truck_id"] for truck in trucks), tuple(truck["BL"] for truck in trucks))
+
+
+# A schedule as one small integer per truck: slots[i] is the index of truck i's time segment.
+# Copying or moving a truck copies a few bytes per truck, the truck table is never copied.
+class Schedule:
+    __slots__ = ("trucks", "slots")
+
+    def __init__(self, trucks, slots):
+        self.trucks = trucks
+        self.slots = np.asarray(slots, dtype=np.int16)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __eq__(self, other):
+        return isinstance(other, Schedule) and (self.trucks is other.trucks or self.trucks == other.trucks) and np.array_equal(self.slots, other.slots)
+
+    def __hash__(self):
+        return hash(self.slots.tobytes())
+
+    def copy(self):
+        return Schedule(self.trucks, self.slots.copy())
+
+    # New schedule with truck index moved to slot
+    def with_move(self, index, slot):
+        moved = self.copy()
+        moved.slots[index] = slot
+        return moved
+
+    # Number of trucks in each of the n_slots time segments
+    def counts(self, n_slots):
+        return np.bincount(self.slots, minlength=n_slots)
+
+    # The schedule in the original DataFrame layout, with (start, end) tuples as "Time Segment"
+    def to_dataframe(self, time_segments):
+        import pandas as pd
+
+        return pd.DataFrame({
+            "truck_id": list(self.trucks.truck_ids),
+            "BL": list(self.trucks.bls),
+            "Time Segment": [time_segments[slot] for slot in self.slots],
+        })
+
+    @classmethod
+    def from_dataframe(cls, schedule, time_segments):
+        segment_index = {time_segment: i for i, time_segment in enumerate(time_segments)}
+        trucks = TruckTable(tuple(schedule["truck_id"]), tuple(schedule["BL"]))
+        return cls(trucks, [segment_index[tuple(time_segment)] for time_segment in schedule["Time Segment"]])
@@ -0,0 +1,80 @@
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+# Instrumentation of a tabu search: wall time per phase, counters (objective evaluations,
+# simulation lookups, simulations actually run) and the current/best objective of every iteration.
+# Each iteration is written as one JSON line to path, if given, and everything is totalled for
+# the end-of-run summary, so a long run shows where its time goes without a profiler.
+class SearchTelemetry:
+
+    def __init__(self, path=None):
+        self.path = path
+        self.file = open(path, "w") if path is not None else None
+        self.start = time.perf_counter()
+        self.iterations = 0
+        self.phase_seconds = Counter()
+        self.counts = Counter()
+        self.iteration_phase_seconds = Counter()
+        self.iteration_counts = Counter()
+        self.best_time = None
+        self.best_max_time = None
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.iteration_phase_seconds[name] += time.perf_counter() - start
+
+    def count(self, counts):
+        self.iteration_counts.update(counts)
+
+    def end_iteration(self, iteration, current_time, best_time, best_max_time, **fields):
+        self.iterations += 1
+        self.best_time = best_time
+        self.best_max_time = best_max_time
+        self.phase_seconds.update(self.iteration_phase_seconds)
+        self.counts.update(self.iteration_counts)
+        if self.file is not None:
+            record = {
+                "iteration": iteration,
+                "current_time": current_time,
+                "best_time": best_time,
+                "phase_seconds": dict(self.iteration_phase_seconds),
+                **dict(self.iteration_counts),
+                **fields,
+            }
+            self.file.write(json.dumps(record, default=float) + "\n")
+        self.iteration_phase_seconds = Counter()
+        self.iteration_counts = Counter()
+
+    # cache: the simulation cache of this process, if there is one
+    def summary(self, cache=None):
+        calls = self.counts["simulation_calls"]
+        summary = {
+            "iterations": self.iterations,
+            "wall_seconds": time.perf_counter() - self.start,
+            "phase_seconds": dict(self.phase_seconds),
+            **dict(self.counts),
+            "best_time": self.best_time,
+            "best_max_time": self.best_max_time,
+        }
+        if calls:
+            # Lookups answered without running a simulation, counted in every process
+            summary["cache_hit_rate"] = 1 - self.counts["simulation_runs"] / calls
+        if cache is not None:
+            summary["cache"] = cache.stats()
+        return summary
+
+    # Write the summary as the last line of the trace and close it
+    def close(self, cache=None):
+        summary = self.summary(cache)
+        if self.file is not None:
+            self.file.write(json.dumps({"summary": summary}, default=float) + "\n")
+            self.file.close()
+            self.file = None
+        return summary
@@ -0,0 +1,85 @@
+import os
+import pickle
+from collections import OrderedDict
+
+from pfe.datastore import atomic_write
+
+
+# Least-recently-used cache of simulation results, optionally persisted to a local pickle file
+# so that repeated runs (another day, another tabu search) start warm.
+class SimulationCache:
+
+    def __init__(self, maxsize=4096, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    # Return the cached value for key, calling compute() and storing its result on a miss
+    def get_or_compute(self, key, compute):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    # Add entries computed elsewhere (another process's cache) and the lookups that went into them
+    def merge(self, entries, hits=0, misses=0):
+        for key, value in entries.items():
+            self.put(key, value)
+        self.hits += hits
+        self.misses += misses
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def load(self):
+        with open(self.path, "rb") as file:
+            entries = pickle.load(file)
+        for key, value in entries.items():
+            self.put(key, value)
+
+    def save(self):
+        if self.path is None:
+            return
+        with atomic_write(self.path, "wb") as file:
+            pickle.dump(dict(self.entries), file, protocol=pickle.HIGHEST_PROTOCOL)
@@ -0,0 +1,123 @@
+import argparse
+import datetime
+
+import numpy as np
+
+from pfe.level2Montefuction import MontecarloSim, distributions, simulate_time_at_base
+from pfe.sampling import as_generator, draw_uniforms
+
+# Response surface of MontecarloSim: its only varying inputs are the arrival hour, the number of
+# trucks at the base and the segment, so it is simulated once on that grid and looked up afterwards.
+# "other" stands for any segment without tool waiting data.
+SEGMENTS = ["DNM", "TST", "WL", "other"]
+HOURS = 24
+QUANTILES = [5, 25, 50, 75, 95]
+
+TABLE_PATH = "montecarlo_surface.npz"
+
+
+# Simulate every (segment, hour, truck count) of the grid with the same n_samples uniforms and
+# save the median, std and QUANTILES of the time at the base (hours) to path
+def build_table(path=TABLE_PATH, max_trucks=12, n_samples=2**15, sampling="sobol", rng=None):
+    truck_counts = np.arange(max_trucks + 1)
+    u = draw_uniforms(sampling, n_samples, len(distributions), rng)
+    shape = (len(SEGMENTS), HOURS, len(truck_counts))
+    median = np.zeros(shape)
+    std = np.zeros(shape)
+    quantiles = np.zeros(shape + (len(QUANTILES),))
+
+    for s, segment in enumerate(SEGMENTS):
+        for hour in range(HOURS):
+            for k, num_trucks in enumerate(truck_counts):
+                simulation_results = simulate_time_at_base(hour, num_trucks, segment, u) / 60
+                median[s, hour, k] = np.percentile(simulation_results, 50)
+                std[s, hour, k] = np.std(simulation_results)
+                quantiles[s, hour, k] = np.percentile(simulation_results, QUANTILES)
+
+    np.savez_compressed(
+        path,
+        segments=np.array(SEGMENTS),
+        truck_counts=truck_counts,
+        median=median,
+        std=std,
+        quantiles=quantiles,
+        quantile_levels=np.array(QUANTILES),
+        n_samples=len(u),
+        sampling=sampling,
+    )
+
+
+class SurfaceTable:
+
+    def __init__(self, path=TABLE_PATH):
+        with np.load(path) as table:
+            self.segment_index = {segment: s for s, segment in enumerate(table["segments"].tolist())}
+            self.truck_counts = table["truck_counts"].astype(float)
+            self.median = table["median"]
+            self.std = table["std"]
+            self.quantiles = table["quantiles"]
+            self.quantile_levels = table["quantile_levels"].tolist()
+
+    def segment_row(self, segment):
+        return self.segment_index.get(segment, self.segment_index["other"])
+
+    # Interpolated linearly between truck counts of the grid, held constant beyond its last count
+    def interpolate(self, values, hour, num_trucks, segment):
+        return np.interp(num_trucks, self.truck_counts, values[self.segment_row(segment), hour])
+
+    # Same (median, std) contract as MontecarloSim
+    def lookup(self, arrival_time_at_base, num_trucks_at_base, segment):
+        hour = arrival_time_at_base.hour
+        return (
+            self.interpolate(self.median, hour, num_trucks_at_base, segment),
+            self.interpolate(self.std, hour, num_trucks_at_base, segment),
+        )
+
+    def quantile(self, level, arrival_time_at_base, num_trucks_at_base, segment):
+        q = self.quantile_levels.index(level)
+        return self.interpolate(self.quantiles[..., q], arrival_time_at_base.hour, num_trucks_at_base, segment)
+
+
+# Compare the table with live MontecarloSim runs on n_checks random (hour, trucks, segment) points,
+# truck counts going past the end of the grid. Returns the absolute deviations of median and std.
+def check_table(table, n_checks=50, max_trucks=20, hours=range(8, 17), rng=None):
+    rng = as_generator(rng)
+    hours = list(hours)
+    median_deviation = []
+    std_deviation = []
+    for _ in range(n_checks):
+        hour = hours[rng.integers(len(hours))]
+        num_trucks = int(rng.integers(max_trucks + 1))
+        segment = SEGMENTS[rng.integers(len(SEGMENTS))]
+        arrival_time_at_base = datetime.datetime(1900, 1, 1, hour, 0)
+        live_median, live_std = MontecarloSim(arrival_time_at_base, num_trucks, segment, rng=rng)
+        table_median, table_std = table.lookup(arrival_time_at_base, num_trucks, segment)
+        median_deviation.append(abs(live_median - table_median))
+        std_deviation.append(abs(live_std - table_std))
+    return {
+        "checks": n_checks,
+        "median_mean_abs_deviation": np.mean(median_deviation),
+        "median_max_abs_deviation": np.max(median_deviation),
+        "std_mean_abs_deviation": np.mean(std_deviation),
+        "std_max_abs_deviation": np.max(std_deviation),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or check the MontecarloSim response surface table")
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--path", default=TABLE_PATH)
+    parser.add_argument("--samples", type=int, default=2**15)
+    parser.add_argument("--checks", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_table(args.path, n_samples=args.samples)
+        print(f"Response surface written to {args.path}")
+    else:
+        for name, value in check_table(SurfaceTable(args.path), args.checks).items():
+            print(f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+from collections import deque
+
+
+# Tabu status kept on move attributes instead of whole schedules: after truck i leaves slot s,
+# moving truck i back to s is forbidden for `tenure` iterations. Lookups are one dict access
+# and expired entries are dropped from the front of a queue, so the cost of the memory does not
+# depend on the number of trucks.
+class TabuMemory:
+
+    def __init__(self, tenure):
+        self.tenure = tenure
+        self.expiry = {}
+        self.queue = deque()
+
+    def __len__(self):
+        return len(self.expiry)
+
+    def __contains__(self, attribute):
+        return attribute in self.expiry
+
+    # Forbid moving truck back to slot until iteration + tenure
+    def add(self, truck, slot, iteration):
+        expiry = iteration + self.tenure
+        self.expiry[(truck, slot)] = expiry
+        self.queue.append((expiry, (truck, slot)))
+
+    # Drop every attribute whose tenure is over at this iteration
+    def expire(self, iteration):
+        while self.queue and self.queue[0][0] <= iteration:
+            expiry, attribute = self.queue.popleft()
+            # The attribute may have been added again since, with a later expiry
+            if self.expiry.get(attribute) == expiry:
+                del self.expiry[attribute]
+
+    def is_tabu(self, truck, slot, iteration):
+        return self.expiry.get((truck, slot), iteration) > iteration
+
+    # A tabu move is still allowed when it beats the best objective found so far (aspiration)
+    def is_allowed(self, truck, slot, iteration, objective, best_objective):
+        return not self.is_tabu(truck, slot, iteration) or objective < best_objective
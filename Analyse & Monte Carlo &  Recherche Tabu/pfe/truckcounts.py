@@ -0,0 +1,156 @@
+import io
+import os
+import pickle
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from pfe.datastore import atomic_write
+
+HOURS = 24
+
+
+# Entries and exits of every day and hour of a gate log (EnteryExit.csv layout).
+# Returns the dates and two (number of dates, 24) arrays of entry and exit counts.
+def hourly_events(data):
+    dates = pd.to_datetime(data['Date'], dayfirst=True).dt.date
+    entry_hours = data['EntryTime'].str.split(':').str[0].astype(int).to_numpy()
+    exit_hours = data['ExitTime'].str.split(':').str[0].astype(int).to_numpy()
+    day_codes, unique_dates = pd.factorize(dates)
+    n_days = len(unique_dates)
+    entries = np.bincount(day_codes * HOURS + entry_hours, minlength=n_days * HOURS).reshape(n_days, HOURS)
+    exits = np.bincount(day_codes * HOURS + exit_hours, minlength=n_days * HOURS).reshape(n_days, HOURS)
+    return list(unique_dates), entries, exits
+
+
+# Trucks in the base at each hour of a day: everything that entered up to that hour,
+# minus everything that left before it
+def trucks_in_base(entries, exits):
+    left_before = np.concatenate([[0], np.cumsum(exits)[:-1]])
+    return np.cumsum(entries) - left_before
+
+
+# Per-day entries/exits of the gate log, the trucks in the base they give, and streaming per-hour
+# aggregates over the days, persisted to a local pickle file. ingest() only reads the part of the
+# gate log appended since the last call, so a daily refresh costs time in proportion to the new
+# rows. The mean and standard deviation follow Welford's update and the median comes from a
+# histogram of the (integer) counts, so adding or correcting a day never revisits the others.
+class TruckCountStore:
+
+    def __init__(self, path=None):
+        self.path = path
+        self.reset()
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def reset(self):
+        self.entries = {}
+        self.exits = {}
+        self.counts = {}
+        self.n = 0
+        self.mean = np.zeros(HOURS)
+        self.m2 = np.zeros(HOURS)
+        self.histograms = [Counter() for _ in range(HOURS)]
+        # Gate log read so far: its header and the byte offset reached
+        self.header = None
+        self.offset = 0
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add_counts(self, counts):
+        self.n += 1
+        delta = counts - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (counts - self.mean)
+        for hour, count in enumerate(counts.tolist()):
+            self.histograms[hour][count] += 1
+
+    def remove_counts(self, counts):
+        self.n -= 1
+        if self.n == 0:
+            self.mean[:] = 0
+            self.m2[:] = 0
+        else:
+            delta = counts - self.mean
+            self.mean -= delta / self.n
+            self.m2 -= delta * (counts - self.mean)
+        for hour, count in enumerate(counts.tolist()):
+            self.histograms[hour][count] -= 1
+            if self.histograms[hour][count] == 0:
+                del self.histograms[hour][count]
+
+    # Add the entries/exits of new gate log rows; a date already in the store is updated
+    def add_events(self, dates, entries, exits):
+        for date, day_entries, day_exits in zip(dates, entries, exits):
+            if date in self.counts:
+                self.remove_counts(self.counts[date])
+                day_entries = day_entries + self.entries[date]
+                day_exits = day_exits + self.exits[date]
+            self.entries[date] = day_entries
+            self.exits[date] = day_exits
+            self.counts[date] = trucks_in_base(day_entries, day_exits)
+            self.add_counts(self.counts[date])
+
+    # Read the rows appended to the gate log at path since the last call. A log that got shorter
+    # or has another header was rewritten, and is read again from the start.
+    def ingest(self, path):
+        with open(path, 'rb') as file:
+            header = file.readline()
+            if header != self.header or os.path.getsize(path) < self.offset:
+                self.reset()
+                self.header = header
+                self.offset = file.tell()
+            file.seek(self.offset)
+            new_rows = file.read()
+        # A last line without its newline may still be being written, leave it for the next call
+        new_rows = new_rows[:new_rows.rfind(b'\n') + 1]
+        if new_rows.strip():
+            data = pd.read_csv(io.BytesIO(header + new_rows), encoding='utf-8-sig')
+            self.add_events(*hourly_events(data))
+        self.offset += len(new_rows)
+
+    # Trucks in the base by hour (rows) and date (columns), as computed by nbtrucksinbase.py
+    def truck_count(self):
+        dates = sorted(self.counts)
+        return pd.DataFrame({date: self.counts[date] for date in dates}, index=range(HOURS), columns=dates)
+
+    def median(self):
+        if self.n == 0:
+            return np.full(HOURS, np.nan)
+        medians = []
+        for histogram in self.histograms:
+            values = sorted(histogram)
+            cumulative = np.cumsum([histogram[value] for value in values])
+            # Mean of the two middle values when the number of days is even, like np.median
+            low = values[np.searchsorted(cumulative, (self.n + 1) // 2)]
+            high = values[np.searchsorted(cumulative, self.n // 2 + 1)]
+            medians.append((low + high) / 2)
+        return np.array(medians)
+
+    # Average, median and standard deviation over the days for each hour of the day, all NaN
+    # while the store has no days
+    def summary(self):
+        if self.n == 0:
+            average = std_dev = np.full(HOURS, np.nan)
+        else:
+            average = self.mean
+            std_dev = np.sqrt(np.maximum(self.m2, 0) / self.n)
+        return pd.DataFrame({
+            'Hour': range(HOURS),
+            'Average': average,
+            'Median': self.median(),
+            'StdDev': std_dev,
+        })
+
+    def load(self):
+        with open(self.path, 'rb') as file:
+            self.__dict__.update(pickle.load(file))
+
+    def save(self):
+        if self.path is None:
+            return
+        state = {name: value for name, value in self.__dict__.items() if name != 'path'}
+        with atomic_write(self.path, 'wb') as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
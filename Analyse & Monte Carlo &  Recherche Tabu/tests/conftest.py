@@ -0,0 +1,13 @@
+import os
+
+import pytest
+
+from pfe import paramtables
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# The exported tables are read from the data folder, wherever pytest is run from
+@pytest.fixture(autouse=True)
+def data_dir(monkeypatch):
+    monkeypatch.setattr(paramtables, "DATA_DIR", os.path.dirname(HERE))
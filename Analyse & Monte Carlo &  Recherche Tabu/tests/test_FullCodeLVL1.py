@@ -0,0 +1,40 @@
+import numpy as np
+
+from pfe.FullCodeLVL1 import destination_arrivals, overnight_rollover
+
+
+def times(*values):
+    return np.array(values, dtype="datetime64[us]")
+
+
+def test_arrival_at_night_start_is_kept():
+    assert overnight_rollover(times("2024-03-04T23:00"), times("2024-03-04T15:00")) == times("2024-03-04T23:00")
+
+
+def test_arrival_during_the_night_is_driven_from_night_end():
+    start = times("2024-03-04T15:00", "2024-03-04T15:00", "2024-03-04T15:00")
+    arrival = times("2024-03-04T23:30", "2024-03-05T02:00", "2024-03-05T08:00")
+    # 30 minutes and 3 hours were left at 23:00; an arrival at 08:00 is after the night already
+    expected = times("2024-03-05T08:30", "2024-03-05T11:00", "2024-03-05T08:00")
+    assert (overnight_rollover(arrival, start) == expected).all()
+
+
+def test_trip_started_the_day_before():
+    start = times("2024-03-03T20:00", "2024-03-03T06:00", "2024-03-03T23:30")
+    arrival = times("2024-03-04T01:00", "2024-03-04T15:00", "2024-03-04T01:00")
+    # Only the trip still under way at 23:00 rolls over; the last one set off during the night
+    expected = times("2024-03-04T10:00", "2024-03-04T15:00", "2024-03-04T01:00")
+    assert (overnight_rollover(arrival, start) == expected).all()
+
+
+def test_destination_arrivals_mixed_batch():
+    start = times("2024-03-04T07:30", "2024-03-04T16:00")
+    arrival_at_base = times("2024-03-04T10:00", "2024-03-04T20:00")
+    # One column per percentile: the evening mission reaches its destination at 22:00, 00:00 and 02:00
+    time_at_base = np.array([[1.0, 2.0, 3.0], [1.0, 3.0, 5.0]])
+    # 80 km is one hour of driving without a pause
+    etas = destination_arrivals(start, arrival_at_base, time_at_base, [80, 80])
+
+    assert etas.shape == (2, 3)
+    assert (etas[0] == times("2024-03-04T12:00", "2024-03-04T13:00", "2024-03-04T14:00")).all()
+    assert (etas[1] == times("2024-03-04T22:00", "2024-03-05T09:00", "2024-03-05T11:00")).all()
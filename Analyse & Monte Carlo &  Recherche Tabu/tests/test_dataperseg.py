@@ -0,0 +1,37 @@
+import datetime
+
+import pandas as pd
+
+from pfe.dataperseg import hourly_occupancy
+
+
+def test_visit_crossing_midnight_counts_on_both_days():
+    df = pd.DataFrame({
+        "Seg": ["DNM", "WL"],
+        "entry_time": pd.to_datetime(["1900-03-01 22:30", "1900-03-02 10:00"]),
+        # Exit times carry the entry's date: the first visit left at 01:15 the next morning
+        "exit_time": pd.to_datetime(["1900-03-01 01:15", "1900-03-02 10:45"]),
+    })
+    counts, segments, days = hourly_occupancy(df)
+
+    assert segments == ["DNM", "WL"]
+    assert days == [datetime.date(1900, 3, 1), datetime.date(1900, 3, 2)]
+    assert counts.shape == (3, 2, 24)
+    dnm, wl = counts[1], counts[2]
+    assert dnm[0].nonzero()[0].tolist() == [22, 23]
+    assert dnm[1].nonzero()[0].tolist() == [0, 1]
+    assert wl[0].sum() == 0
+    assert wl[1].nonzero()[0].tolist() == [10]
+    assert (counts[0] == dnm + wl).all()
+
+
+def test_no_visits():
+    df = pd.DataFrame({
+        "Seg": pd.Series([], dtype=object),
+        "entry_time": pd.Series([], dtype="datetime64[ns]"),
+        "exit_time": pd.Series([], dtype="datetime64[ns]"),
+    })
+    counts, segments, days = hourly_occupancy(df)
+
+    assert counts.shape == (1, 0, 24)
+    assert segments == [] and days == []
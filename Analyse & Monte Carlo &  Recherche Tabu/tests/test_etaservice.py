@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from pfe import etaservice
+from pfe.etaservice import EtaClient, EtaService
+
+MISSION = {"distance_to_md1": 100, "distance_to_base": 40, "segment": "DNM", "start": "2024-03-04 07:30"}
+
+
+# Requests sent in turn to a small service listening on a free localhost port
+def round_trip(requests):
+    async def run():
+        service = EtaService(n_samples=256, seed=0, warm_trucks=1)
+        server = await service.start(etaservice.HOST, 0)
+        client = await EtaClient.connect(etaservice.HOST, server.sockets[0].getsockname()[1])
+        try:
+            return [await client.request(*request) for request in requests]
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+            for task in service.tasks:
+                task.cancel()
+    return asyncio.run(run())
+
+
+def test_eta_and_time_at_base():
+    (eta_status, eta), (time_status, times), (health_status, health) = round_trip([
+        ("POST", "/eta", {"missions": [MISSION, dict(MISSION, start="2024-03-04 21:30")]}),
+        ("POST", "/time-at-base", {"queries": [{"arrival_hour": 10, "num_trucks": 3, "segment": "WL"}]}),
+        ("GET", "/health"),
+    ])
+    assert eta_status == 200
+    morning, evening = eta["missions"]
+    assert morning["arrival_at_base"] == "2024-03-04T08:45:00"
+    assert morning["eta_p5"] <= morning["eta_p50"] <= morning["eta_p95"]
+    # Still on the road at 23:00: the end of the trip is driven the next morning
+    assert evening["eta_p50"] >= "2024-03-05T08:00:00"
+    assert time_status == 200
+    assert set(times["results"][0]) == {"median", "std"}
+    assert health_status == 200 and health["requests"] == 3
+
+
+@pytest.mark.parametrize("missions", [
+    [],
+    [dict(MISSION, segment="XYZ")],
+    [dict(MISSION, distance_to_md1=float("nan"))],
+    [MISSION, dict(MISSION, distance_to_base=1e30)],
+    [dict(MISSION, distance_to_md1=-5)],
+])
+def test_invalid_missions_are_rejected(missions):
+    [(status, body)] = round_trip([("POST", "/eta", {"missions": missions})])
+    assert status == 400
+    assert "error" in body
+
+
+def test_wrong_method_and_path():
+    (method_status, _), (path_status, _) = round_trip([("GET", "/eta"), ("POST", "/nowhere", {})])
+    assert method_status == 405
+    assert path_status == 404
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from pfe import level2ExecutionCode
+from pfe.level2ExecutionCode import IncrementalObjective, objective_function, random_move, solution_zero
+
+
+# Every simulation of a test runs on the same small bank of common random numbers
+@pytest.fixture(autouse=True)
+def common_random_numbers():
+    level2ExecutionCode.simulation_cache.clear()
+    level2ExecutionCode.use_common_random_numbers(256, 0)
+    yield
+    level2ExecutionCode.use_common_random_numbers(None)
+    level2ExecutionCode.simulation_cache.clear()
+
+
+def test_incremental_objective_follows_moves():
+    rng = np.random.default_rng(1)
+    trucks = [{"truck_id": f"{i:03d}", "BL": bl} for i, bl in enumerate(rng.choice(["DNM", "TST", "WL"], 20))]
+    schedule = solution_zero(trucks, rng)
+    objective = IncrementalObjective(schedule)
+    for _ in range(30):
+        truck, new_slot = random_move(schedule, rng)
+        objective.move(schedule.trucks.bls[truck], int(schedule.slots[truck]), new_slot)
+        schedule = schedule.with_move(truck, new_slot)
+
+        simulation_time, last_nonempty_time = objective.value()
+        expected_time, expected_last_nonempty_time = objective_function(schedule)
+        assert simulation_time == pytest.approx(expected_time)
+        assert last_nonempty_time == expected_last_nonempty_time
+
+
+def test_tabu_search_restores_simulation_settings():
+    bank = level2ExecutionCode.sample_bank
+    trucks = [{"truck_id": f"{i:03d}", "BL": "DNM"} for i in range(5)]
+    level2ExecutionCode.tabu_search(trucks, 2, 1, crn_samples=64, seed=3)
+    assert level2ExecutionCode.sample_bank is bank
+    assert level2ExecutionCode.surrogate_table is None
+    assert level2ExecutionCode.simulation_seed is None
+
+
+def test_tabu_search_same_with_workers():
+    rng = np.random.default_rng(2)
+    trucks = [{"truck_id": f"{i:03d}", "BL": bl} for i, bl in enumerate(rng.choice(["DNM", "TST", "WL"], 12))]
+    results = []
+    for workers in [None, 2]:
+        level2ExecutionCode.simulation_cache.clear()
+        _, best_time, best_max_time = level2ExecutionCode.tabu_search(
+            trucks, 4, 2, crn_samples=64, neighborhood_size=6, workers=workers, seed=5
+        )
+        results.append((best_time, best_max_time))
+    assert results[0] == results[1]
@@ -0,0 +1,57 @@
+import pandas as pd
+
+from pfe.truckcounts import TruckCountStore
+
+HEADER = "Date,EntryTime,ExitTime\n"
+FIRST_ROWS = "01/03/2024,8:10,9:20\n01/03/2024,9:05,12:40\n02/03/2024,7:55,8:30\n"
+APPENDED_ROWS = "02/03/2024,10:00,11:15\n03/03/2024,14:20,16:05\n"
+
+
+# Rows appended to the gate log between two ingests, the last one still being written the
+# first time, give the same store as reading the whole log at once
+def test_ingest_appended_rows(tmp_path):
+    path = tmp_path / "EnteryExit.csv"
+    path.write_text(HEADER + FIRST_ROWS + APPENDED_ROWS[:15])
+    store = TruckCountStore()
+    store.ingest(path)
+    assert len(store) == 2
+
+    path.write_text(HEADER + FIRST_ROWS + APPENDED_ROWS)
+    store.ingest(path)
+    full = TruckCountStore()
+    full.ingest(path)
+
+    assert len(store) == 3
+    pd.testing.assert_frame_equal(store.truck_count(), full.truck_count())
+    pd.testing.assert_frame_equal(store.summary(), full.summary())
+    assert store.truck_count()[pd.Timestamp("2024-03-02").date()].tolist()[7:12] == [1, 1, 0, 1, 1]
+
+
+# A store saved and loaded again carries on ingesting from where it stopped
+def test_ingest_after_reload(tmp_path):
+    path = tmp_path / "EnteryExit.csv"
+    path.write_text(HEADER + FIRST_ROWS)
+    store = TruckCountStore(str(tmp_path / "store.pkl"))
+    store.ingest(path)
+    store.save()
+
+    with open(path, "a") as file:
+        file.write(APPENDED_ROWS)
+    reloaded = TruckCountStore(str(tmp_path / "store.pkl"))
+    reloaded.ingest(path)
+    full = TruckCountStore()
+    full.ingest(path)
+    pd.testing.assert_frame_equal(reloaded.summary(), full.summary())
+
+
+# A gate log without any visit leaves nothing to average
+def test_summary_without_days(tmp_path):
+    path = tmp_path / "EnteryExit.csv"
+    path.write_text(HEADER)
+    store = TruckCountStore()
+    store.ingest(path)
+    summary = store.summary()
+
+    assert len(store) == 0
+    assert summary["Hour"].tolist() == list(range(24))
+    assert summary[["Average", "Median", "StdDev"]].isna().all().all()